@@ -4,7 +4,11 @@ import altair as alt
 import time
 import json
 import re
+import hashlib
+import threading
 from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from snowflake.snowpark.context import get_active_session
 
 st.set_page_config(
@@ -69,18 +73,37 @@ MODELS = [
 if 'insights_history' not in st.session_state:
     st.session_state.insights_history = []
 
-if 'data_cache' not in st.session_state:
-    st.session_state.data_cache = {}
-
 try:
     session = get_active_session()
 except Exception as e:
     st.error(f"❌ Error connecting to Snowflake: {str(e)}")
     st.stop()
 
-def query_snowflake(query):
+# Query results are shared across reruns and sessions: every viewer runs as the app owner's role and sees the same rows.
+# Entries are keyed by the table's LAST_ALTERED time, so the next rerun after a Fivetran sync queries fresh data.
+QUERY_CACHE_TTL_SECONDS = 600
+QUERY_CACHE_MAX_ENTRIES = 64
+TABLE_VERSION_TTL_SECONDS = 60
+
+@st.cache_data(ttl=TABLE_VERSION_TTL_SECONDS, show_spinner=False)
+def table_version(table):
+    """Return when the table was last written, looked up at most once a minute"""
+    try:
+        rows = session.sql(
+            "SELECT LAST_ALTERED FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = CURRENT_SCHEMA() AND TABLE_NAME = ?",
+            params=[table.upper()]
+        ).collect()
+        return str(rows[0][0]) if rows else None
+    except Exception:
+        return None
+
+@st.cache_data(ttl=QUERY_CACHE_TTL_SECONDS, max_entries=QUERY_CACHE_MAX_ENTRIES, show_spinner=False)
+def run_cached_query(query, params, version):
+    return session.sql(query, params=params).to_pandas()
+
+def query_snowflake(query, params=None, table=None):
     try:
-        return session.sql(query).to_pandas()
+        return run_cached_query(query, params, table_version(table or table_name))
     except Exception as e:
         st.error(f"Query failed: {str(e)}")
         return pd.DataFrame()
@@ -91,66 +114,323 @@ def load_data():
     df.columns = [col.lower() for col in df.columns]
     return df
 
-def call_cortex_model(prompt, model_name):
+PROFILE_STATS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+
+def numeric_value(data, col):
+    """SQL for a column's numeric value, picked from how the loaded sample decoded the column"""
+    if data[col].dtype == 'bool':
+        return f"CAST({col} AS INTEGER)"
+    if pd.api.types.is_numeric_dtype(data[col]):
+        return col
+    return f"TRY_TO_DOUBLE(TO_VARCHAR({col}))"
+
+def whole_number(value):
+    """Return a sum as an int when it has no fractional part, so a count of flags reads 523 rather than 523.0"""
+    value = float(value) if value is not None else float("nan")
+    return int(value) if value.is_integer() else value
+
+def count_sql(data, col, test):
+    """SQL counting the rows that pass a count test: equals a value, at_least a value, or distinct values"""
+    if test == "equals":
+        return f"COUNT_IF({col} = ?)"
+    if test == "at_least":
+        return f"COUNT_IF({numeric_value(data, col)} >= ?)"
+    return f"COUNT(DISTINCT {col})"
+
+def sample_count(data, col, test, value):
+    """Count the loaded sample's rows that pass a count test"""
+    if test == "equals":
+        return int((data[col] == value).sum())
+    if test == "at_least":
+        return int((pd.to_numeric(data[col], errors='coerce') >= value).sum())
+    return int(data[col].nunique())
+
+def sample_profile(data, numeric_cols, categorical_cols, correlations=True, counts=()):
+    """Compute the statistics of table_profile() from the loaded sample"""
+    numeric = data[numeric_cols].apply(pd.to_numeric, errors='coerce').astype(float)
+    pairs = numeric.corr() if correlations else None
+    return {
+        "rows": len(data),
+        "numeric": numeric.describe().reindex(PROFILE_STATS),
+        "sums": {col: whole_number(numeric[col].sum()) for col in numeric_cols},
+        "top_values": {col: list(data[col].value_counts().head(3).items()) for col in categorical_cols},
+        "correlations": [(a, b, pairs.loc[a, b]) for i, a in enumerate(numeric_cols) for b in numeric_cols[i + 1:]] if correlations else [],
+        "counts": {(col, test, value): sample_count(data, col, test, value) for col, test, value in counts},
+    }
+
+def table_profile(data, numeric_cols, categorical_cols, correlations=True, counts=()):
+    """Compute statistics over the whole table in a single query pushed down to Snowflake.
+
+    Returns the row count, describe()-style statistics and the sum per numeric column, the top 3 values per categorical
+    column, the correlation of each pair of numeric columns unless correlations is False, and the number of rows that
+    pass each (column, test, value) count in counts. Percentiles and top values are approximate.
+    Falls back to the loaded sample if the query fails.
+    """
+    numeric_cols = [col for col in dict.fromkeys(numeric_cols) if col in data.columns]
+    categorical_cols = [col for col in dict.fromkeys(categorical_cols) if col in data.columns]
+    counts = [count for count in dict.fromkeys(counts) if count[0] in data.columns]
+    values = [numeric_value(data, col) for col in numeric_cols]
+    pairs = [(i, j) for i in range(len(numeric_cols)) for j in range(i + 1, len(numeric_cols))] if correlations else []
+
+    select = ["COUNT(*) AS row_count"]
+    for i, value in enumerate(values):
+        select += [
+            f"COUNT({value}) AS n{i}_count", f"AVG({value}) AS n{i}_mean", f"STDDEV({value}) AS n{i}_std",
+            f"MIN({value}) AS n{i}_min", f"APPROX_PERCENTILE({value}, 0.25) AS n{i}_p25",
+            f"APPROX_PERCENTILE({value}, 0.5) AS n{i}_p50", f"APPROX_PERCENTILE({value}, 0.75) AS n{i}_p75",
+            f"MAX({value}) AS n{i}_max", f"SUM({value}) AS n{i}_sum",
+        ]
+    select += [f"APPROX_TOP_K({col}, 3) AS c{i}_top" for i, col in enumerate(categorical_cols)]
+    select += [f"CORR({values[i]}, {values[j]}) AS r{k}_corr" for k, (i, j) in enumerate(pairs)]
+    select += [f"{count_sql(data, col, test)} AS k{i}_count" for i, (col, test, value) in enumerate(counts)]
+    params = [value for col, test, value in counts if test != "distinct"]
+
+    result = query_snowflake(f"SELECT {', '.join(select)} FROM {table_name}", params or None)
+    if result.empty:
+        return sample_profile(data, numeric_cols, categorical_cols, correlations, counts)
+    row = {key.lower(): value for key, value in result.iloc[0].items()}
+
+    suffixes = ["count", "mean", "std", "min", "p25", "p50", "p75", "max"]
+    numeric = pd.DataFrame(
+        {col: [row[f"n{i}_{suffix}"] for suffix in suffixes] for i, col in enumerate(numeric_cols)},
+        index=PROFILE_STATS, dtype=object,
+    ).astype(float)
+    top_values = {}
+    for i, col in enumerate(categorical_cols):
+        top = row[f"c{i}_top"]
+        top = json.loads(top) if isinstance(top, str) else (top or [])
+        top_values[col] = [(value, count) for value, count in top]
+    pair_correlations = [(numeric_cols[i], numeric_cols[j], float(row[f"r{k}_corr"]) if row[f"r{k}_corr"] is not None else float("nan"))
+                    for k, (i, j) in enumerate(pairs)]
+    sums = {col: whole_number(row[f"n{i}_sum"]) for i, col in enumerate(numeric_cols)}
+    counts = {count: int(row[f"k{i}_count"]) for i, count in enumerate(counts)}
+    return {"rows": int(row["row_count"]), "numeric": numeric, "sums": sums, "top_values": top_values,
+            "correlations": pair_correlations, "counts": counts}
+
+def profile_summary(profile):
+    """Describe a profile's numeric ranges and top categorical values for a Cortex prompt"""
+    summary = ""
+    for col in profile["numeric"].columns:
+        stats = profile["numeric"][col]
+        if not pd.isna(stats["mean"]):
+            summary += f"- {col} (avg: {stats['mean']:.2f}, min: {stats['min']:.2f}, max: {stats['max']:.2f})\n"
+    for col, top in profile["top_values"].items():
+        summary += f"\nTop {col} values:\n" + "\n".join(f"- {k}: {v}" for k, v in top)
+    return summary
+
+def correlation_summary(profile, label):
+    """List the three strongest correlations of a profile for a Cortex prompt"""
+    pairs = [(a, b, r) for a, b, r in profile["correlations"] if not pd.isna(r)]
+    pairs.sort(key=lambda pair: abs(pair[2]), reverse=True)
+    if not pairs:
+        return ""
+    return f"Top correlations between {label}:\n" + "".join(f"- {a} and {b}: r = {r:.2f}\n" for a, b, r in pairs[:3])
+
+def column_stat(col, stat, value=None):
+    """Return a whole-table statistic of a column from the Metrics tab profile, or from the sample if it is not profiled.
+
+    Besides the describe() statistics and "sum", stat can be "top" for the most frequent value and its count, or one
+    of the count tests "equals", "at_least" and "distinct" listed in METRICS_COUNTS.
+    """
+    if stat == "top":
+        top = metrics_profile["top_values"].get(col) or list(data[col].value_counts().head(1).items())
+        return top[0][0], int(top[0][1])
+    if stat in ("equals", "at_least", "distinct"):
+        count = metrics_profile["counts"].get((col, stat, value))
+        return count if count is not None else sample_count(data, col, stat, value)
+    numeric = metrics_profile["numeric"]
+    if col not in numeric.columns:
+        return getattr(data[col], stat)()
+    if stat == "sum":
+        return metrics_profile["sums"][col]
+    return numeric.loc[{"median": "50%"}.get(stat, stat), col]
+
+# Data Explorer pages are read from Snowflake with keyset pagination: each page starts after the
+# (sort column, record_id) key of the previous page's last row, so any page costs one page of rows.
+EXPLORER_KEY = "record_id"
+
+def query_value(value):
+    """Convert a pandas cell to a value Snowflake can bind as a query parameter"""
+    if value is None or pd.isna(value):
+        return None
+    if hasattr(value, "to_pydatetime"):
+        return value.to_pydatetime()
+    return value.item() if hasattr(value, "item") else value
+
+def explorer_filter(filter_col, filter_text):
+    """Return the server-side filter of the Data Explorer as SQL conditions and parameters"""
+    if filter_col and filter_text:
+        # Match the text literally: escape the backslash, % and _ so they are not LIKE wildcards
+        pattern = filter_text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return [f"TO_VARCHAR({filter_col}) ILIKE ? ESCAPE '\\\\'"], [f"%{pattern}%"]
+    return [], []
+
+def explorer_page(filter_col, filter_text, sort_col, descending, cursor, rows_per_page):
+    """Fetch the page that starts after cursor and return it with the cursor of the following page, or None on the last page"""
+    conditions, params = explorer_filter(filter_col, filter_text)
+    direction, after = ("DESC", "<") if descending else ("ASC", ">")
+    if sort_col == EXPLORER_KEY:
+        order = f"{EXPLORER_KEY} {direction}"
+        if cursor is not None:
+            conditions.append(f"{EXPLORER_KEY} {after} ?")
+            params.append(cursor[1])
+    else:
+        # Rows without a sort value come last, ordered by record_id
+        order = f"{sort_col} {direction} NULLS LAST, {EXPLORER_KEY} {direction}"
+        if cursor is not None and cursor[0] is None:
+            conditions.append(f"({sort_col} IS NULL AND {EXPLORER_KEY} {after} ?)")
+            params.append(cursor[1])
+        elif cursor is not None:
+            conditions.append(f"({sort_col} {after} ? OR {sort_col} IS NULL OR ({sort_col} = ? AND {EXPLORER_KEY} {after} ?))")
+            params += [cursor[0], cursor[0], cursor[1]]
+
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    # One extra row tells whether there is a next page
+    page = query_snowflake(f"SELECT * FROM {table_name}{where} ORDER BY {order} LIMIT {rows_per_page + 1}", params)
+    page.columns = [col.lower() for col in page.columns]
+    if len(page) <= rows_per_page:
+        return page, None
+    page = page.iloc[:rows_per_page]
+    last = page.iloc[-1]
+    return page, (query_value(last[sort_col]), query_value(last[EXPLORER_KEY]))
+
+def explorer_count(filter_col, filter_text):
+    conditions, params = explorer_filter(filter_col, filter_text)
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    result = query_snowflake(f"SELECT COUNT(*) AS row_count FROM {table_name}{where}", params)
+    return int(result.iloc[0, 0]) if not result.empty else 0
+
+def explorer_next(cursor):
+    st.session_state.explorer_cursors.append(cursor)
+
+def explorer_previous():
+    st.session_state.explorer_cursors.pop()
+
+def explorer_first():
+    st.session_state.explorer_cursors = []
+
+# Cortex completions are cached in a Snowflake table shared by every session and app restart, with an in-process LRU
+# in front of it. A completion is reused for the same model and prompt (ignoring whitespace) for CORTEX_CACHE_TTL_SECONDS,
+# and with CORTEX_CACHE_BY_DATA_VERSION only until the next Fivetran sync changes the table.
+CORTEX_CACHE_TABLE = "CORTEX_COMPLETION_CACHE"
+CORTEX_CACHE_TTL_SECONDS = 24 * 60 * 60
+CORTEX_CACHE_MAX_ENTRIES = 256
+CORTEX_CACHE_BY_DATA_VERSION = True
+
+@st.cache_resource(show_spinner=False)
+def cortex_cache():
+    """Create the completion cache table if needed and return the in-process LRU with its hit/miss counters"""
+    persistent = True
+    try:
+        session.sql(
+            f"CREATE TABLE IF NOT EXISTS {CORTEX_CACHE_TABLE} "
+            "(CACHE_KEY STRING, MODEL STRING, DATA_VERSION STRING, RESPONSE STRING, CREATED_AT TIMESTAMP_LTZ)"
+        ).collect()
+        session.sql(
+            f"DELETE FROM {CORTEX_CACHE_TABLE} WHERE CREATED_AT < DATEADD('second', ?, CURRENT_TIMESTAMP())",
+            params=[-CORTEX_CACHE_TTL_SECONDS]
+        ).collect()
+    except Exception:
+        # The app's role may not be allowed to create tables; completions are then cached in memory only
+        persistent = False
+    return {"entries": OrderedDict(), "lock": threading.Lock(), "persistent": persistent,
+            "memory_hits": 0, "table_hits": 0, "misses": 0}
+
+def cortex_cache_key(prompt, model_name):
+    """Return the digest a completion is cached under and the data version it is tied to"""
+    version = table_version(table_name) if CORTEX_CACHE_BY_DATA_VERSION else None
+    normalized = " ".join(prompt.split())
+    key = hashlib.sha256(json.dumps([model_name, normalized, version]).encode("utf-8")).hexdigest()
+    return key, version
+
+def remember_completion(cache, key, response, stored_at):
+    with cache["lock"]:
+        cache["entries"][key] = (response, stored_at)
+        cache["entries"].move_to_end(key)
+        while len(cache["entries"]) > CORTEX_CACHE_MAX_ENTRIES:
+            cache["entries"].popitem(last=False)
+
+def cached_completion(cache, key):
+    """Return a cached completion from the LRU, then from the cache table, or None on a miss"""
+    with cache["lock"]:
+        entry = cache["entries"].get(key)
+        if entry and time.time() - entry[1] < CORTEX_CACHE_TTL_SECONDS:
+            cache["entries"].move_to_end(key)
+            cache["memory_hits"] += 1
+            return entry[0]
+    rows = []
+    if cache["persistent"]:
+        try:
+            rows = session.sql(
+                f"SELECT RESPONSE, DATEDIFF('second', CREATED_AT, CURRENT_TIMESTAMP()) AS AGE FROM {CORTEX_CACHE_TABLE} "
+                "WHERE CACHE_KEY = ? AND CREATED_AT >= DATEADD('second', ?, CURRENT_TIMESTAMP())",
+                params=[key, -CORTEX_CACHE_TTL_SECONDS]
+            ).collect()
+        except Exception:
+            rows = []
+    if rows:
+        remember_completion(cache, key, rows[0][0], time.time() - rows[0][1])
+        with cache["lock"]:
+            cache["table_hits"] += 1
+        return rows[0][0]
+    with cache["lock"]:
+        cache["misses"] += 1
+    return None
+
+def store_completion(cache, key, model_name, version, response):
+    remember_completion(cache, key, response, time.time())
+    if not cache["persistent"]:
+        return
     try:
+        session.sql(
+            f"MERGE INTO {CORTEX_CACHE_TABLE} t USING (SELECT ? AS CACHE_KEY, ? AS MODEL, ? AS DATA_VERSION, ? AS RESPONSE) s "
+            "ON t.CACHE_KEY = s.CACHE_KEY "
+            "WHEN MATCHED THEN UPDATE SET RESPONSE = s.RESPONSE, CREATED_AT = CURRENT_TIMESTAMP() "
+            "WHEN NOT MATCHED THEN INSERT (CACHE_KEY, MODEL, DATA_VERSION, RESPONSE, CREATED_AT) "
+            "VALUES (s.CACHE_KEY, s.MODEL, s.DATA_VERSION, s.RESPONSE, CURRENT_TIMESTAMP())",
+            params=[key, model_name, version, response]
+        ).collect()
+    except Exception:
+        # A failed write only costs a completion on the next app restart
+        pass
+
+def cortex_cache_caption():
+    cache = cortex_cache()
+    with cache["lock"]:
+        memory_hits, table_hits, misses = cache["memory_hits"], cache["table_hits"], cache["misses"]
+    where = f"{table_hits} from {CORTEX_CACHE_TABLE}" if cache["persistent"] else "table unavailable, memory only"
+    return f"Completion cache: {memory_hits + table_hits} hits ({memory_hits} in memory, {where}), {misses} misses since the app started"
+
+def cortex_complete(prompt, model_name, cache, key, version):
+    """Return a completion from the cache or from Cortex. It makes no Streamlit calls, so it can run on worker threads"""
+    response = cached_completion(cache, key)
+    if response is None:
         cortex_query = "SELECT SNOWFLAKE.CORTEX.COMPLETE(?, ?) AS response"
         response = session.sql(cortex_query, params=[model_name, prompt]).collect()[0][0]
-        return response
+        if response:
+            store_completion(cache, key, model_name, version, response)
+    return response
+
+def call_cortex_model(prompt, model_name):
+    try:
+        key, version = cortex_cache_key(prompt, model_name)
+        return cortex_complete(prompt, model_name, cortex_cache(), key, version)
     except Exception as e:
         st.error(f"❌ Cortex error: {str(e)}")
         return None
 
-def generate_insights(data, focus_area, model_name):
+def insights_prompt(data, focus_area):
+    # Statistics cover the whole table: they are computed in Snowflake, not from the loaded sample
+    key_metrics = ["readmission_risk", "medical_error_rate", "patient_outcome_score", "cost_of_care", "length_of_stay", "medication_cost", "total_cost_savings"]
+    categorical_options = ["patient_id", "medical_history", "current_medications", "lab_results", "vital_signs", "diagnosis", "treatment_plan", "clinical_trial_id", "trial_name", "trial_status", "medical_publication_id", "publication_title", "medication_side_effects", "allergies", "medical_conditions", "family_medical_history", "genetic_data", "treatment_outcome", "medication_adherence", "patient_satisfaction", "medication_recommendation", "treatment_recommendation"]
+    profile = table_profile(data, key_metrics, categorical_options)
+
     data_summary = f"Table: {table_name}\n"
     data_summary += f"Description: {table_description}\n"
-    data_summary += f"Records analyzed: {len(data)}\n"
+    data_summary += f"Records analyzed: {profile['rows']}\n"
+    data_summary += profile_summary(profile)
 
-    # Calculate basic statistics for numeric columns
-    numeric_stats = {}
-    key_metrics = ["readmission_risk", "medical_error_rate", "patient_outcome_score", "cost_of_care", "length_of_stay", "medication_cost", "total_cost_savings"]
-    for col in key_metrics:
-        if col in data.columns:
-            numeric_stats[col] = {
-                "mean": data[col].mean(),
-                "min": data[col].min(),
-                "max": data[col].max(),
-                "std": data[col].std()
-            }
-            data_summary += f"- {col} (avg: {data[col].mean():.2f}, min: {data[col].min():.2f}, max: {data[col].max():.2f})\n"
-
-    # Get top values for categorical columns
-    categorical_stats = {}
-    categorical_options = ["patient_id", "medical_history", "current_medications", "lab_results", "vital_signs", "diagnosis", "treatment_plan", "clinical_trial_id", "trial_name", "trial_status", "medical_publication_id", "publication_title", "medication_side_effects", "allergies", "medical_conditions", "family_medical_history", "genetic_data", "treatment_outcome", "medication_adherence", "patient_satisfaction", "medication_recommendation", "treatment_recommendation"]
-    for cat_col in categorical_options:
-        if cat_col in data.columns:
-            top = data[cat_col].value_counts().head(3)
-            categorical_stats[cat_col] = top.to_dict()
-            data_summary += f"\nTop {cat_col} values:\n" + "\n".join(f"- {k}: {v}" for k, v in top.items())
-
-    # Calculate correlations if enough numeric columns available
-    correlation_info = ""
-    if len(key_metrics) >= 2:
-        try:
-            correlations = data[key_metrics].corr()
-            # Get the top 3 strongest correlations (absolute value)
-            corr_pairs = []
-            for i in range(len(correlations.columns)):
-                for j in range(i+1, len(correlations.columns)):
-                    col1 = correlations.columns[i]
-                    col2 = correlations.columns[j]
-                    corr_value = correlations.iloc[i, j]
-                    corr_pairs.append((col1, col2, abs(corr_value), corr_value))
-
-            # Sort by absolute correlation value
-            corr_pairs.sort(key=lambda x: x[2], reverse=True)
-
-            # Add top correlations to the summary
-            if corr_pairs:
-                correlation_info = "Top correlations between metrics:\n"
-                for col1, col2, _, corr_value in corr_pairs[:3]:
-                    correlation_info += f"- {col1} and {col2}: r = {corr_value:.2f}\n"
-        except:
-            correlation_info = "Could not calculate correlations between metrics.\n"
+    correlation_info = correlation_summary(profile, "metrics")
 
     # Define specific instructions for each focus area
     focus_area_instructions = {
@@ -248,7 +528,58 @@ def generate_insights(data, focus_area, model_name):
     - Use bullet points and clear section headers for readability
     '''
 
-    return call_cortex_model(prompt, model_name)
+    return prompt
+
+def generate_insights(data, focus_area, model_name):
+    return call_cortex_model(insights_prompt(data, focus_area), model_name)
+
+# Each compared model runs on its own worker thread, so the comparison takes as long as the slowest model
+COMPARE_MAX_MODELS = 4
+
+def render_model_comparison(data, focus_area):
+    """Send the focus area's prompt to several models concurrently and show the answers side by side as they arrive"""
+    models = st.multiselect("Models to compare", MODELS, default=MODELS[:2], max_selections=COMPARE_MAX_MODELS)
+    if not st.button("Compare Models", disabled=len(models) < 2):
+        return
+
+    prompt = insights_prompt(data, focus_area)
+    cache = cortex_cache()
+    placeholders = {}
+    for column, model in zip(st.columns(len(models)), models):
+        with column:
+            st.markdown(f"**{model}**")
+            placeholders[model] = st.empty()
+            placeholders[model].info("Waiting for Cortex...")
+
+    def complete(model, key, version):
+        started = time.time()
+        return cortex_complete(prompt, model, cache, key, version), time.time() - started
+
+    started = time.time()
+    latencies = {}
+    with ThreadPoolExecutor(max_workers=len(models)) as pool:
+        # Cache keys are looked up here because the table version lookup is a Streamlit cache call
+        futures = {pool.submit(complete, model, *cortex_cache_key(prompt, model)): model for model in models}
+        for future in as_completed(futures):
+            model = futures[future]
+            try:
+                response, latencies[model] = future.result()
+            except Exception as e:
+                placeholders[model].error(f"❌ Cortex error: {str(e)}")
+                continue
+            with placeholders[model].container():
+                st.caption(f"{latencies[model]:.1f}s · {len(response or ''):,} characters")
+                st.markdown(response or "No insights returned.")
+            if response:
+                st.session_state.insights_history.append({
+                    "timestamp": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M"),
+                    "focus": focus_area,
+                    "model": model,
+                    "insights": response
+                })
+    if latencies:
+        st.caption(f"{len(latencies)} models answered in {time.time() - started:.1f}s, "
+                   f"{sum(latencies.values()):.1f}s if they had been called one after another")
 
 data = load_data()
 if data.empty:
@@ -264,6 +595,13 @@ numeric_candidates = [col for col in sample_cols if data[col].dtype in ['float64
 date_candidates = [col for col in sample_cols if 'date' in col.lower() or 'timestamp' in col.lower()]
 cat_candidates = [col for col in sample_cols if data[col].dtype == 'object' and data[col].nunique() < 1000]
 
+# Whole-table statistics for the Metrics tab, computed in Snowflake rather than from the loaded sample
+# Top values and (column, test, value) counts for the Key Insights panel, computed in the same query as the profile
+METRICS_TOP_VALUES = []
+METRICS_COUNTS = []
+metrics_profile = table_profile(data, [col for col in data.columns if pd.api.types.is_numeric_dtype(data[col])], METRICS_TOP_VALUES,
+                                correlations=False, counts=METRICS_COUNTS)
+
 # Four tabs - with Metrics as the first tab (Tab 0)
 tabs = st.tabs(["📊 Metrics", "✨ AI Insights", "📁 Insights History", "🔍 Data Explorer"])
 
@@ -276,10 +614,10 @@ with tabs[0]:
     col1, col2, col3, col4 = st.columns(4)
     
     # Calculate metrics from the data
-    avg_outcome_score = data['patient_outcome_score'].mean() if 'patient_outcome_score' in data.columns else 0
-    avg_error_rate = data['medical_error_rate'].mean() if 'medical_error_rate' in data.columns else 0
-    avg_readmission_risk = data['readmission_risk'].mean() if 'readmission_risk' in data.columns else 0
-    total_cost_savings = data['total_cost_savings'].sum() if 'total_cost_savings' in data.columns else 0
+    avg_outcome_score = column_stat('patient_outcome_score', 'mean') if 'patient_outcome_score' in data.columns else 0
+    avg_error_rate = column_stat('medical_error_rate', 'mean') if 'medical_error_rate' in data.columns else 0
+    avg_readmission_risk = column_stat('readmission_risk', 'mean') if 'readmission_risk' in data.columns else 0
+    total_cost_savings = column_stat('total_cost_savings', 'sum') if 'total_cost_savings' in data.columns else 0
     
     with col1:
         with st.container(border=True):
@@ -322,17 +660,17 @@ with tabs[0]:
     
     with col1:
         with st.container(border=True):
-            avg_cost_of_care = data['cost_of_care'].mean() if 'cost_of_care' in data.columns else 0
+            avg_cost_of_care = column_stat('cost_of_care', 'mean') if 'cost_of_care' in data.columns else 0
             st.metric("Avg Cost of Care", f"${avg_cost_of_care:,.2f}")
         
     with col2:
         with st.container(border=True):
-            avg_medication_cost = data['medication_cost'].mean() if 'medication_cost' in data.columns else 0
+            avg_medication_cost = column_stat('medication_cost', 'mean') if 'medication_cost' in data.columns else 0
             st.metric("Avg Medication Cost", f"${avg_medication_cost:,.2f}")
         
     with col3:
         with st.container(border=True):
-            avg_los = data['length_of_stay'].mean() if 'length_of_stay' in data.columns else 0
+            avg_los = column_stat('length_of_stay', 'mean') if 'length_of_stay' in data.columns else 0
             st.metric("Avg Length of Stay", f"{avg_los:.1f} days")
     
     # Create two columns for charts
@@ -524,6 +862,11 @@ with tabs[1]:
             else:
                 st.error("No insights returned.")
 
+    with st.expander("⚖️ Compare Models"):
+        render_model_comparison(data, focus_area)
+
+    st.caption(cortex_cache_caption())
+
 # Insights History tab
 with tabs[2]:
     st.subheader("📁 Insights History")
@@ -537,9 +880,35 @@ with tabs[2]:
 # Data Explorer tab
 with tabs[3]:
     st.subheader("🔍 Data Explorer")
+    columns = list(data.columns)
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        filter_col = st.selectbox("Filter column", ["(none)"] + columns)
+    with col2:
+        filter_text = st.text_input("Contains")
+    with col3:
+        sort_col = st.selectbox("Sort by", columns, index=columns.index(EXPLORER_KEY) if EXPLORER_KEY in columns else 0)
+    with col4:
+        descending = st.radio("Order", ["Ascending", "Descending"], horizontal=True) == "Descending"
     rows_per_page = st.slider("Rows per page", 5, 50, 10)
-    page = st.number_input("Page", min_value=1, value=1)
-    start = (page - 1) * rows_per_page
-    end = min(start + rows_per_page, len(data))
-    st.dataframe(data.iloc[start:end], use_container_width=True)
-    st.caption(f"Showing rows {start + 1}–{end} of {len(data)}")
\ No newline at end of file
+    filter_col = None if filter_col == "(none)" else filter_col
+
+    # Start from the first page whenever the filter, sort or page size changes
+    view = (filter_col, filter_text, sort_col, descending, rows_per_page)
+    if st.session_state.get("explorer_view") != view:
+        st.session_state.explorer_view = view
+        st.session_state.explorer_cursors = []
+    cursors = st.session_state.explorer_cursors
+
+    page, next_cursor = explorer_page(filter_col, filter_text, sort_col, descending, cursors[-1] if cursors else None, rows_per_page)
+    start = len(cursors) * rows_per_page
+    if page.empty:
+        st.info("No rows match the filter.")
+    else:
+        st.dataframe(page, use_container_width=True)
+        st.caption(f"Showing rows {start + 1}–{start + len(page)} of {explorer_count(filter_col, filter_text)}")
+
+    first, previous, following = st.columns(3)
+    first.button("⏮ First", on_click=explorer_first, disabled=not cursors)
+    previous.button("◀ Previous", on_click=explorer_previous, disabled=not cursors)
+    following.button("Next ▶", on_click=explorer_next, args=(next_cursor,), disabled=next_cursor is None)
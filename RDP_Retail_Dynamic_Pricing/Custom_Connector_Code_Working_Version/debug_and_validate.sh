@@ -25,7 +25,7 @@ if [ ! -f "$CONNECTOR_FILE" ]; then
 fi
 
 # Extract table name from connector.py (POSIX-compatible)
-TABLE_NAME=$(grep '"table"' "$CONNECTOR_FILE" | sed -E 's/.*"table": *"([^"]+)".*/\1/' | head -n 1)
+TABLE_NAME=$(grep 'DATASETS\["' "$CONNECTOR_FILE" | sed -E 's/.*DATASETS\["([^"]+)"\].*/\1/' | head -n 1)
 
 echo -e "${GREEN}✓ Detected table name: $TABLE_NAME${NC}"
 
@@ -69,6 +69,9 @@ if [ -f "$WAREHOUSE_DB" ]; then
         echo -e "${CYAN}Running query:${NC} SELECT * FROM tester.${TABLE_NAME} ORDER BY record_id LIMIT 5;"
         echo
         duckdb "$WAREHOUSE_DB" "SELECT * FROM tester.${TABLE_NAME} ORDER BY record_id LIMIT 5;"
+        echo
+        echo -e "${CYAN}Sync metrics:${NC}"
+        duckdb "$WAREHOUSE_DB" "SELECT table_name, status, pages, records, skipped_records, bytes, retries, throttle_wait_seconds, health_score, duration_seconds FROM tester.connector_sync_metrics WHERE row_type = 'summary' ORDER BY recorded_at DESC LIMIT 1;" 2>/dev/null || echo "  connector_sync_metrics not found (sync_metrics disabled)."
     else
         echo -e "${YELLOW}DuckDB command-line tool not found. Install it or run this manually:${NC}"
         echo "duckdb \"$WAREHOUSE_DB\" \"SELECT * FROM tester.${TABLE_NAME} ORDER BY record_id LIMIT 5;\""
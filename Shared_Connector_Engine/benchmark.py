@@ -0,0 +1,248 @@
+"""Throughput benchmark for the industry connectors, run against the local mock API.
+
+Each case runs one connector's update() generator to completion in a fresh Python process, so peak RSS is per case,
+and reports records/sec, bytes/sec, p50/p99 page latency, peak RSS and checkpoint count. Results are written as JSON
+and can be compared with a previous run to catch regressions between commits:
+
+    python benchmark.py --verticals tlc,agr --page-sizes 100,1000 --sizes 10000,1000000 --output after.json --compare before.json
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import platform
+import resource
+import subprocess
+import importlib.util
+from datetime import datetime, timezone
+
+ENGINE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(ENGINE_DIR)
+
+def connector_paths():
+    """Return the path of every industry connector.py, keyed by endpoint prefix (agr, cds, ...)"""
+    paths = {}
+    for name in sorted(os.listdir(REPO_ROOT)):
+        path = os.path.join(REPO_ROOT, name, "Custom_Connector_Code_Working_Version", "connector.py")
+        if os.path.isfile(path):
+            paths[name[:3].lower()] = path
+    return paths
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def peak_rss_mb():
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_case(connector_path, configuration):
+    """Run one connector's update() to completion and return its measurements (called in the case's own process)"""
+    sys.path.insert(0, os.path.dirname(connector_path))
+    from fivetran_connector_sdk import Logging
+    Logging.LOG_LEVEL = Logging.Level.WARNING
+
+    spec = importlib.util.spec_from_file_location("benchmarked_connector", connector_path)
+    connector = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(connector)
+
+    import connector_engine.sync as sync
+    import connector_engine.client as client
+    import connector_engine.async_client as async_client
+    from connector_engine.metrics import METRICS_TABLE
+
+    # Count operations instead of handing them to the SDK, so the numbers measure the connector itself
+    counts = {"upserts": 0, "checkpoints": 0}
+    class CountingOperations:
+        @staticmethod
+        def upsert(table, data):
+            if table != METRICS_TABLE:
+                counts["upserts"] += 1
+        @staticmethod
+        def checkpoint(state):
+            counts["checkpoints"] += 1
+    sync.op = CountingOperations
+
+    # A page's bytes and latency are filled in once its records have been read, so collect them from pages
+    # fetched earlier without holding on to the pages themselves
+    in_flight = []
+    latencies = []
+    total_bytes = 0
+    def collect_read_pages():
+        nonlocal total_bytes
+        for page in [page for page in in_flight if page["latency"] is not None]:
+            in_flight.remove(page)
+            latencies.append(page["latency"] * 1000)
+            total_bytes += page["bytes"]
+
+    fetch_page = client.fetch_page
+    def recording_fetch_page(*args, **kwargs):
+        collect_read_pages()
+        page = fetch_page(*args, **kwargs)
+        in_flight.append(page)
+        return page
+    client.fetch_page = recording_fetch_page
+
+    # The async engine fetches on its event loop and returns pages that are already complete
+    fetch_page_async = async_client.fetch_page_async
+    async def recording_fetch_page_async(*args, **kwargs):
+        page = await fetch_page_async(*args, **kwargs)
+        in_flight.append(page)
+        return page
+    async_client.fetch_page_async = recording_fetch_page_async
+
+    started = time.perf_counter()
+    for _ in connector.update(configuration, {}):
+        pass
+    seconds = time.perf_counter() - started
+    collect_read_pages()
+
+    return {
+        "records": counts["upserts"],
+        "pages": len(latencies),
+        "checkpoints": counts["checkpoints"],
+        "seconds": round(seconds, 3),
+        "records_per_sec": round(counts["upserts"] / seconds, 1) if seconds else None,
+        "bytes_per_sec": round(total_bytes / seconds, 1) if seconds else None,
+        "p50_page_latency_ms": round(percentile(latencies, 0.50), 2) if latencies else None,
+        "p99_page_latency_ms": round(percentile(latencies, 0.99), 2) if latencies else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_mock_api(records, max_page_size, latency_ms, record_pool):
+    """Start mock_api.py in its own process so generating pages does not compete with the connector for the GIL"""
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(ENGINE_DIR, "mock_api.py"), "--port", str(port), "--records", str(records),
+         "--max-page-size", str(max_page_size), "--latency-ms", str(latency_ms), "--record-pool", str(record_pool)],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return server, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("Mock API did not start")
+
+def git_commit():
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True).strip()
+        dirty = subprocess.call(["git", "diff", "--quiet", "HEAD"], cwd=REPO_ROOT) != 0
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def case_key(result):
+    return (result["vertical"], result["dataset_size"], result["page_size"])
+
+def compare(results, baseline_path, threshold):
+    """Print each case against the baseline run and return the cases that regressed by more than threshold"""
+    with open(baseline_path, "r") as f:
+        baseline = {case_key(result): result for result in json.load(f)["results"]}
+
+    regressions = []
+    print(f"\n{'case':<28} {'records/sec':>24} {'peak RSS MB':>22}")
+    for result in results:
+        before = baseline.get(case_key(result))
+        if not before or not before["records_per_sec"] or not result["records_per_sec"]:
+            continue
+        speed = result["records_per_sec"] / before["records_per_sec"] - 1
+        memory = result["peak_rss_mb"] / before["peak_rss_mb"] - 1 if before["peak_rss_mb"] else 0
+        name = f"{result['vertical']} n={result['dataset_size']} ps={result['page_size']}"
+        flag = ""
+        if speed < -threshold or memory > threshold:
+            regressions.append(result)
+            flag = "  REGRESSION"
+        print(f"{name:<28} {before['records_per_sec']:>10.0f} -> {result['records_per_sec']:>8.0f} ({speed:+.0%})"
+              f" {before['peak_rss_mb']:>7.1f} -> {result['peak_rss_mb']:>6.1f} ({memory:+.0%}){flag}")
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark connector throughput against the local mock API")
+    parser.add_argument("--verticals", default="", help="Comma-separated connector prefixes, e.g. tlc,agr (all when empty)")
+    parser.add_argument("--page-sizes", default="100,200,1000", help="Comma-separated page sizes")
+    parser.add_argument("--sizes", default="10000", help="Comma-separated dataset sizes, e.g. 10000,100000,1000000,10000000")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latency the mock API adds to every page")
+    parser.add_argument("--record-pool", type=int, default=1000, help="Distinct records the mock API cycles through (0 generates every record)")
+    parser.add_argument("--config", action="append", default=[], help="Extra connector configuration as KEY=VALUE, e.g. prefetch_depth=0")
+    parser.add_argument("--output", default="benchmark_results.json", help="File the JSON results are written to")
+    parser.add_argument("--compare", help="Results file of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown or memory growth reported as a regression")
+    parser.add_argument("--run-case", nargs=2, metavar=("CONNECTOR", "CONFIGURATION"), help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Child process: run a single case and print its measurements
+    if args.run_case:
+        print(json.dumps(run_case(args.run_case[0], json.loads(args.run_case[1]))))
+        return 0
+
+    paths = connector_paths()
+    verticals = [prefix.strip() for prefix in args.verticals.split(",") if prefix.strip()] or list(paths)
+    page_sizes = [int(size) for size in args.page_sizes.split(",")]
+    sizes = [int(size) for size in args.sizes.split(",")]
+    extra = dict(item.split("=", 1) for item in args.config)
+
+    results = []
+    for size in sizes:
+        server, base_url = start_mock_api(size, max(page_sizes), args.latency_ms, args.record_pool)
+        try:
+            for prefix in verticals:
+                for page_size in page_sizes:
+                    configuration = {
+                        "api_key": "benchmark",
+                        "base_url": base_url,
+                        "page_size": str(page_size),
+                        "adaptive_page_size": "false",
+                        "max_sync_seconds": "0",
+                        **extra,
+                    }
+                    output = subprocess.check_output(
+                        [sys.executable, os.path.abspath(__file__), "--run-case", paths[prefix], json.dumps(configuration)],
+                        text=True,
+                    )
+                    result = {"vertical": prefix, "dataset_size": size, "page_size": page_size, **json.loads(output.strip().splitlines()[-1])}
+                    results.append(result)
+                    print(f"{prefix} n={size} ps={page_size}: {result['records_per_sec']:.0f} records/s, "
+                          f"{result['bytes_per_sec'] / 1e6:.1f} MB/s, p50 {result['p50_page_latency_ms']} ms, "
+                          f"p99 {result['p99_page_latency_ms']} ms, peak {result['peak_rss_mb']} MB, {result['checkpoints']} checkpoints")
+        finally:
+            server.terminate()
+            server.wait()
+
+    report = {
+        "commit": git_commit(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"latency_ms": args.latency_ms, "record_pool": args.record_pool, "config": extra},
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+import json
+from fivetran_connector_sdk import Connector
+from fivetran_connector_sdk import Logging as log
+from connector_engine import DATASETS, build_schema, sync_datasets
+
+def selected_datasets(configuration: dict):
+    """Return the dataset specs listed in the datasets configuration value (all of them when empty)"""
+    tables = [table.strip() for table in configuration.get('datasets', '').split(',') if table.strip()]
+    unknown = [table for table in tables if table not in DATASETS]
+    if unknown:
+        log.warning(f"Ignoring unknown datasets: {', '.join(unknown)}")
+    return [DATASETS[table] for table in tables if table in DATASETS] or list(DATASETS.values())
+
+def schema(configuration: dict):
+    """Define the table schema for every selected dataset"""
+    return build_schema(configuration, selected_datasets(configuration))
+
+def update(configuration: dict, state: dict):
+    """Extract data for every selected dataset concurrently over one shared HTTP client and yield operations"""
+    yield from sync_datasets(configuration, state, selected_datasets(configuration))
+
+# This creates the connector object that will use the update function defined in this connector.py file.
+connector = Connector(update=update, schema=schema)
+
+# Check if the script is being run as the main module.
+# This is useful for debugging while you write your code. Note this method is not called by Fivetran when executing your connector in production.
+if __name__ == "__main__":
+    # Open the configuration.json file and load its contents into a dictionary.
+    with open("configuration.json", "r") as f:
+        configuration = json.load(f)
+    connector.debug(configuration=configuration)
@@ -0,0 +1,6 @@
+"""Shared connector engine: one sync loop for every dataset served by the demo API"""
+from connector_engine.datasets import DATASETS
+from connector_engine.client import create_client
+from connector_engine.sync import build_schema, sync_dataset, sync_datasets
+
+__all__ = ["DATASETS", "create_client", "build_schema", "sync_dataset", "sync_datasets"]
@@ -0,0 +1,190 @@
+import time
+import asyncio
+import requests
+import threading
+from requests.structures import CaseInsensitiveDict
+from fivetran_connector_sdk import Logging as log
+from connector_engine.decoding import loads
+from connector_engine.journal import journal_page
+from connector_engine.breaker import circuit_breakers, endpoint_breaker, allow_request, record_outcome, health_score
+from connector_engine.client import (
+    RETRY_POLICIES, rate_limiter, reserve_token, learn_rate_limit, throttle, classify_error, backoff_delay,
+    is_overload_error, is_api_failure, shrink_page_size,
+)
+
+# The async engine is optional: without aiohttp installed the connector falls back to the requests engine
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+def http_engine(configuration):
+    """Return the HTTP engine to sync with: "sync" (requests, one blocking call per thread) or "async" (aiohttp)"""
+    engine = configuration.get('http_engine', 'sync').lower()
+    if engine == "async" and aiohttp is None:
+        log.warning("http_engine is async but aiohttp is not installed, using the sync engine")
+        return "sync"
+    return "async" if engine == "async" else "sync"
+
+def run_on_loop(loop, coroutine):
+    """Run a coroutine on the client's event loop from a synchronous thread and return its result"""
+    return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+def create_async_client(configuration, pool_size=10):
+    """Create the aiohttp client shared by every dataset, running on its own event loop thread.
+
+    Every page request of every dataset is multiplexed over this one loop and connection pool, while the
+    synchronous sync loop and the SDK operations stay on their own threads.
+    """
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name="http-event-loop", daemon=True)
+    thread.start()
+
+    timeout = float(configuration.get('request_timeout', '30'))
+
+    async def open_session():
+        return aiohttp.ClientSession(
+            headers={"x-api-key": configuration.get('api_key')},
+            connector=aiohttp.TCPConnector(limit=pool_size),
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        )
+
+    return {
+        "session": run_on_loop(loop, open_session()),
+        "limiter": rate_limiter(configuration),
+        "timeout": timeout,
+        "stream_json": False,
+        "engine": "async",
+        "journal": None,
+        "breakers": circuit_breakers(configuration),
+        "loop": loop,
+        "thread": thread,
+    }
+
+def close_async_client(client):
+    """Cancel outstanding requests, close the session and stop the event loop thread"""
+    loop = client["loop"]
+
+    async def shutdown():
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await client["session"].close()
+
+    run_on_loop(loop, shutdown())
+    loop.call_soon_threadsafe(loop.stop)
+    client["thread"].join()
+    loop.close()
+
+async def get(client, url, params):
+    """Send one GET request and return the reply as a requests.Response, so errors are classified like the sync engine's"""
+    try:
+        async with client["session"].get(url, params={key: str(value) for key, value in params.items()}) as reply:
+            body = await reply.read()
+    except asyncio.TimeoutError as e:
+        raise requests.exceptions.Timeout(f"Request to {url} timed out after {client['timeout']}s") from e
+    except aiohttp.ClientError as e:
+        raise requests.exceptions.ConnectionError(str(e)) from e
+
+    response = requests.Response()
+    response.status_code = reply.status
+    response.reason = reply.reason
+    response.headers = CaseInsensitiveDict(reply.headers)
+    response.url = str(reply.url)
+    response.encoding = "utf-8"
+    response._content = body
+    return response
+
+async def fetch_page_async(client, url, params, page_sizer, records_key):
+    """Fetch and decode a single page with the same retry, rate limit and page size handling as fetch_page"""
+    limiter = client["limiter"]
+    breaker = endpoint_breaker(client["breakers"], url)
+    attempts = {}
+    throttle_wait = 0.0
+    while True:
+        params["page_size"] = page_sizer["size"]
+        wait = reserve_token(limiter)
+        while wait > 0:
+            await asyncio.sleep(wait)
+            throttle_wait += wait
+            wait = reserve_token(limiter)
+        # Fail fast instead of retrying while the endpoint's circuit is open
+        allow_request(breaker)
+        try:
+            started = time.time()
+            response = await get(client, url, params)
+            learn_rate_limit(limiter, response)
+            response.raise_for_status()
+            record_outcome(breaker, True, time.time() - started)
+            break
+        except requests.exceptions.RequestException as e:
+            record_outcome(breaker, not is_api_failure(e), None)
+            if is_overload_error(e):
+                shrink_page_size(page_sizer)
+
+            # Retry according to the policy for this class of error
+            error_class = classify_error(e)
+            attempts[error_class] = attempts.get(error_class, 0) + 1
+            max_attempts = RETRY_POLICIES[error_class]["attempts"]
+            if attempts[error_class] >= max_attempts:
+                raise
+            if error_class == "rate_limit":
+                delay = throttle(limiter, e, attempts[error_class])
+            else:
+                delay = backoff_delay(error_class, attempts[error_class])
+            log.warning(f"Request failed with {error_class} error (attempt {attempts[error_class]}/{max_attempts}), retrying in {delay:.1f}s: {str(e)}")
+            await asyncio.sleep(delay)
+            throttle_wait += delay
+
+    latency = time.time() - started
+    if client["journal"]:
+        journal_page(client["journal"], url, params, response, latency)
+
+    data = loads(response.content)
+    return {
+        "data": data,
+        "records": data.pop(records_key, []),
+        "bytes": len(response.content),
+        "latency": latency,
+        "page_size": params["page_size"],
+        "retries": sum(attempts.values()),
+        "throttle_wait": throttle_wait,
+        "health": health_score(breaker),
+    }
+
+def async_prefetch_pages(client, url, params, page_sizer, prefetch_depth, records_key):
+    """Yield pages fetched on the event loop, which stays up to prefetch_depth pages (at least one) ahead"""
+    loop = client["loop"]
+    page_params = dict(params)
+
+    async def new_queue():
+        # Created on the loop so it binds to the loop on every Python version
+        return asyncio.Queue(maxsize=max(1, prefetch_depth))
+
+    pages = run_on_loop(loop, new_queue())
+
+    async def fetch_loop():
+        try:
+            while True:
+                page = await fetch_page_async(client, url, page_params, page_sizer, records_key)
+                await pages.put((page, None))
+                if not page["data"].get("has_more", False):
+                    return
+                if page["data"].get("next_cursor"):
+                    page_params["cursor"] = page["data"]["next_cursor"]
+        except Exception as e:
+            # Hand the error to the consumer so it is handled like a failed request
+            await pages.put((None, e))
+
+    fetcher = asyncio.run_coroutine_threadsafe(fetch_loop(), loop)
+    try:
+        while True:
+            page, error = run_on_loop(loop, pages.get())
+            if error is not None:
+                raise error
+            yield page
+            if not page["data"].get("has_more", False):
+                return
+    finally:
+        fetcher.cancel()
@@ -0,0 +1,77 @@
+import queue
+import threading
+from fivetran_connector_sdk import Logging as log
+from connector_engine.client import put_until_stopped
+
+def backfill_partitions(configuration, state, dataset):
+    """Return the per-partition progress of a partitioned backfill, or None when the dataset syncs as one cursor chain.
+
+    A backfill starts only from empty state (the initial sync or a reset) and resumes from the partitions saved in
+    state until every partition has been read to the end. Datasets that resume from their last cursor are not
+    partitioned: a partition's cursor only positions that partition, so a finished backfill would leave no cursor
+    to resume from and the next sync would read the whole table again.
+    """
+    if "partitions" in state:
+        return {partition: dict(progress) for partition, progress in state["partitions"].items()}
+    count = int(configuration.get('backfill_partitions', '0'))
+    if count <= 1 or state:
+        return None
+    if dataset["keep_last_cursor"]:
+        log.info(f"{dataset['table']}: resumes from its last cursor, so its initial sync reads one cursor chain instead of {count} partitions")
+        return None
+    log.info(f"Starting partitioned backfill with {count} partitions")
+    return {str(partition): {"cursor": None, "has_more": True} for partition in range(count)}
+
+def partition_params(configuration, params, partition, count, cursor):
+    """Build the request parameters that select one partition of the keyspace and its position in it"""
+    request_params = dict(params)
+    request_params[configuration.get('partition_param', 'partition')] = partition
+    request_params[configuration.get('partition_count_param', 'partitions')] = count
+    request_params.pop("cursor", None)
+    if cursor:
+        request_params["cursor"] = cursor
+    return request_params
+
+def build_backfill_state(partitions, pending_watermark, page_size):
+    """Build the checkpoint state of a backfill that still has partitions to read"""
+    partitions = {partition: dict(progress) for partition, progress in partitions.items()}
+    return {"partitions": partitions, "watermark": None, "pending_watermark": pending_watermark, "page_size": page_size}
+
+def partition_pages(prefetch, configuration, client, url, params, partitions, page_sizer, prefetch_depth, records_key):
+    """Fetch every unfinished partition concurrently and yield their pages as one stream, each tagged with its partition"""
+    remaining = [partition for partition, progress in partitions.items() if progress["has_more"]]
+    count = len(partitions)
+    pages = queue.Queue(maxsize=max(1, prefetch_depth) * max(1, len(remaining)))
+    stop = threading.Event()
+
+    def run(partition):
+        request_params = partition_params(configuration, params, int(partition), count, partitions[partition]["cursor"])
+        fetched = prefetch(client, url, request_params, page_sizer, prefetch_depth, records_key)
+        try:
+            for page in fetched:
+                # Other partitions' pages are interleaved with this one, so hand over complete pages only
+                page["records"] = list(page["records"])
+                page["partition"] = partition
+                if not put_until_stopped(pages, (page, None), stop):
+                    return
+        except Exception as e:
+            # Hand the error to the consumer so it is handled like a failed request
+            put_until_stopped(pages, (None, e), stop)
+        finally:
+            fetched.close()
+            put_until_stopped(pages, (None, None), stop)
+
+    for partition in remaining:
+        threading.Thread(target=run, args=(partition,), name=f"backfill-partition-{partition}", daemon=True).start()
+    try:
+        running = len(remaining)
+        while running:
+            page, error = pages.get()
+            if error is not None:
+                raise error
+            if page is None:
+                running -= 1
+                continue
+            yield page
+    finally:
+        stop.set()
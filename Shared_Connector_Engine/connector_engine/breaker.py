@@ -0,0 +1,108 @@
+import time
+import threading
+import requests
+from collections import deque
+from fivetran_connector_sdk import Logging as log
+
+# Outcomes kept per endpoint, whatever the window length
+MAX_WINDOW_REQUESTS = 1000
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while an endpoint's circuit is open"""
+
+def breaker_settings(configuration):
+    """Read the circuit breaker thresholds from the configuration (circuit_breaker false disables it)"""
+    return {
+        "enabled": configuration.get('circuit_breaker', 'true').lower() == 'true',
+        "error_rate": float(configuration.get('circuit_error_rate', '0.5')),
+        "min_requests": int(configuration.get('circuit_min_requests', '5')),
+        "window_seconds": float(configuration.get('circuit_window_seconds', '60')),
+        "open_seconds": float(configuration.get('circuit_open_seconds', '30')),
+        "latency_target": float(configuration.get('health_latency_target_ms', '2000')) / 1000,
+    }
+
+def circuit_breakers(configuration):
+    """Create the per-endpoint circuit breakers shared by every request of a sync"""
+    return {"settings": breaker_settings(configuration), "endpoints": {}, "lock": threading.Lock()}
+
+def endpoint_breaker(breakers, endpoint):
+    """Return the breaker of one endpoint, creating it closed on first use"""
+    with breakers["lock"]:
+        if endpoint not in breakers["endpoints"]:
+            breakers["endpoints"][endpoint] = {
+                "endpoint": endpoint,
+                "settings": breakers["settings"],
+                "state": "closed",
+                "opened_at": 0.0,
+                "probing": False,
+                "window": deque(maxlen=MAX_WINDOW_REQUESTS),
+                "lock": threading.Lock(),
+            }
+        return breakers["endpoints"][endpoint]
+
+def prune(breaker, now):
+    window = breaker["window"]
+    while window and now - window[0][0] > breaker["settings"]["window_seconds"]:
+        window.popleft()
+
+def allow_request(breaker):
+    """Raise CircuitOpenError while the circuit is open; after the cool-down let a single probe request through"""
+    if not breaker["settings"]["enabled"]:
+        return
+    with breaker["lock"]:
+        if breaker["state"] == "closed":
+            return
+        now = time.monotonic()
+        if breaker["state"] == "open" and now - breaker["opened_at"] >= breaker["settings"]["open_seconds"]:
+            breaker["state"] = "half_open"
+            breaker["probing"] = False
+            log.info(f"Circuit for {breaker['endpoint']} is half-open, probing the API")
+        if breaker["state"] == "half_open" and not breaker["probing"]:
+            breaker["probing"] = True
+            return
+    raise CircuitOpenError(f"Circuit for {breaker['endpoint']} is open after repeated failures, not sending requests")
+
+def record_outcome(breaker, ok, latency):
+    """Record a request's outcome and open or close the circuit from the rolling error rate"""
+    if not breaker["settings"]["enabled"]:
+        return
+    settings = breaker["settings"]
+    with breaker["lock"]:
+        now = time.monotonic()
+        breaker["window"].append((now, ok, latency))
+        prune(breaker, now)
+
+        if breaker["state"] == "half_open":
+            breaker["probing"] = False
+            if ok:
+                breaker["state"] = "closed"
+                breaker["window"].clear()
+                log.info(f"Circuit for {breaker['endpoint']} closed, the API is responding again")
+            else:
+                breaker["state"] = "open"
+                breaker["opened_at"] = now
+                log.warning(f"Circuit for {breaker['endpoint']} re-opened, probe request failed")
+            return
+
+        failures = sum(1 for _, succeeded, _ in breaker["window"] if not succeeded)
+        requests_seen = len(breaker["window"])
+        if breaker["state"] == "closed" and requests_seen >= settings["min_requests"] and failures / requests_seen >= settings["error_rate"]:
+            breaker["state"] = "open"
+            breaker["opened_at"] = now
+            log.warning(f"Circuit for {breaker['endpoint']} opened: {failures} of the last {requests_seen} requests failed, "
+                        f"failing fast for {settings['open_seconds']:.0f}s")
+
+def health_score(breaker):
+    """Score an endpoint from 0 to 100 by its rolling success rate, discounted when latency exceeds the target"""
+    with breaker["lock"]:
+        if breaker["state"] == "open":
+            return 0.0
+        prune(breaker, time.monotonic())
+        window = list(breaker["window"])
+    if not window:
+        return 100.0
+    success_rate = sum(1 for _, ok, _ in window if ok) / len(window)
+    latencies = [latency for _, ok, latency in window if ok and latency is not None]
+    average = sum(latencies) / len(latencies) if latencies else 0.0
+    speed = min(1.0, breaker["settings"]["latency_target"] / average) if average else 1.0
+    return round(100 * success_rate * speed, 1)
@@ -0,0 +1,339 @@
+import requests
+import time
+import queue
+import threading
+import random
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from fivetran_connector_sdk import Logging as log
+from connector_engine.decoding import stream_records, loads
+from connector_engine.journal import journal_page
+from connector_engine.breaker import circuit_breakers, endpoint_breaker, allow_request, record_outcome, health_score
+
+# Bytes read from the response body at a time when streaming records
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Retry policy per error class: how many attempts to make and the backoff range in seconds
+RETRY_POLICIES = {
+    "rate_limit": {"attempts": 6, "base_delay": 1.0, "max_delay": 120.0},
+    "server": {"attempts": 4, "base_delay": 1.0, "max_delay": 30.0},
+    "timeout": {"attempts": 3, "base_delay": 2.0, "max_delay": 30.0},
+    "connection": {"attempts": 5, "base_delay": 1.0, "max_delay": 60.0},
+    "client": {"attempts": 1, "base_delay": 0.0, "max_delay": 0.0},
+}
+
+def create_client(configuration, pool_size=10):
+    """Create the HTTP client shared by every dataset: an authenticated session, its rate limiter, timeout and decoding mode"""
+    session = requests.Session()
+    session.headers.update({"x-api-key": configuration.get('api_key')})
+
+    # Size the connection pool so concurrent fetches reuse connections instead of opening new ones
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return {
+        "session": session,
+        "limiter": rate_limiter(configuration),
+        "timeout": float(configuration.get('request_timeout', '30')),
+        "stream_json": configuration.get('stream_json', 'true').lower() == 'true',
+        "engine": "sync",
+        "journal": None,
+        "breakers": circuit_breakers(configuration),
+    }
+
+def classify_error(error):
+    """Map a request error to one of the RETRY_POLICIES error classes"""
+    if isinstance(error, requests.exceptions.Timeout):
+        return "timeout"
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        if error.response.status_code == 429:
+            return "rate_limit"
+        if error.response.status_code >= 500:
+            return "server"
+        return "client"
+    return "connection"
+
+def backoff_delay(error_class, attempt):
+    """Return a full-jitter exponential backoff delay for the given error class and attempt"""
+    policy = RETRY_POLICIES[error_class]
+    return random.uniform(0, min(policy["max_delay"], policy["base_delay"] * 2 ** attempt))
+
+def parse_retry_after(value):
+    """Parse a Retry-After header given in seconds or as an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def rate_limiter(configuration):
+    """Create a token bucket that paces requests, seeded from max_requests_per_second (0 learns from headers)"""
+    rate = float(configuration.get('max_requests_per_second', '0'))
+    return {
+        "configured_rate": rate or None,
+        "rate": rate or None,
+        "tokens": 1.0,
+        "updated": time.monotonic(),
+        "blocked_until": 0.0,
+        "lock": threading.Lock(),
+    }
+
+def reserve_token(limiter):
+    """Take a token from the rate limiter, or return how many seconds to wait before trying again (0 when taken)"""
+    with limiter["lock"]:
+        now = time.monotonic()
+        wait = limiter["blocked_until"] - now
+        if wait > 0:
+            return wait
+        if limiter["rate"] is None:
+            return 0.0
+        # Refill the bucket, allowing at most one second worth of burst
+        capacity = max(1.0, limiter["rate"])
+        limiter["tokens"] = min(capacity, limiter["tokens"] + (now - limiter["updated"]) * limiter["rate"])
+        limiter["updated"] = now
+        if limiter["tokens"] >= 1:
+            limiter["tokens"] -= 1
+            return 0.0
+        return (1 - limiter["tokens"]) / limiter["rate"]
+
+def acquire_token(limiter):
+    """Block until the rate limiter allows another request and return how long it waited"""
+    waited = 0.0
+    while True:
+        wait = reserve_token(limiter)
+        if wait <= 0:
+            return waited
+        time.sleep(wait)
+        waited += wait
+
+def learn_rate_limit(limiter, response):
+    """Update the rate limiter from Retry-After and X-RateLimit-* response headers"""
+    headers = response.headers
+    with limiter["lock"]:
+        now = time.monotonic()
+        retry_after = parse_retry_after(headers.get('Retry-After'))
+        if retry_after is not None and response.status_code in (429, 503):
+            limiter["blocked_until"] = max(limiter["blocked_until"], now + retry_after)
+
+        remaining = headers.get('X-RateLimit-Remaining', headers.get('RateLimit-Remaining'))
+        reset = headers.get('X-RateLimit-Reset', headers.get('RateLimit-Reset'))
+        try:
+            remaining = float(remaining)
+            reset = float(reset)
+        except (TypeError, ValueError):
+            return
+
+        # Reset may be given as seconds until the window resets or as an epoch timestamp
+        reset_in = reset - time.time() if reset > 1e9 else reset
+        reset_in = max(reset_in, 1.0)
+        if remaining <= 0:
+            limiter["blocked_until"] = max(limiter["blocked_until"], now + reset_in)
+            return
+
+        # Pace requests just under the remaining allowance for this window
+        learned_rate = 0.9 * remaining / reset_in
+        if limiter["configured_rate"]:
+            learned_rate = min(learned_rate, limiter["configured_rate"])
+        limiter["rate"] = learned_rate
+
+def throttle(limiter, error, attempt):
+    """Slow the rate limiter down after a 429 and return how long this request should wait"""
+    retry_after = parse_retry_after(error.response.headers.get('Retry-After'))
+    with limiter["lock"]:
+        if limiter["rate"] is not None:
+            limiter["rate"] = max(limiter["rate"] / 2, 0.1)
+        if retry_after is not None:
+            # acquire_token already waits for Retry-After, so only add jitter to spread out retries
+            return random.uniform(0, 1)
+        delay = backoff_delay("rate_limit", attempt)
+        limiter["blocked_until"] = max(limiter["blocked_until"], time.monotonic() + delay)
+        return delay
+
+def page_size_controller(configuration, state):
+    """Create the adaptive page size controller, warm-starting from the page size saved in state"""
+    page_size = int(configuration.get('page_size', '100'))
+    if configuration.get('adaptive_page_size', 'true').lower() != 'true':
+        return {"size": page_size, "min": page_size, "max": page_size, "latency": None}
+
+    min_size = int(configuration.get('min_page_size', '25'))
+    max_size = int(configuration.get('max_page_size', '200'))
+    size = int(state.get('page_size') or page_size)
+    return {"size": max(min_size, min(max_size, size)), "min": min_size, "max": max_size, "latency": None}
+
+def adjust_page_size(page_sizer, latency, record_count, requested_size):
+    """Grow the page size while latency per record keeps falling, and step back when it rises"""
+    # Only full pages fetched at the current size say anything about how the API scales
+    # (prefetched pages may still carry a size from before the last adjustment)
+    if not record_count or record_count < requested_size or requested_size != page_sizer["size"]:
+        return
+
+    per_record = latency / record_count
+    previous = page_sizer["latency"]
+    page_sizer["latency"] = per_record
+    if previous is None or per_record < previous:
+        page_sizer["size"] = min(page_sizer["max"], int(requested_size * 1.5))
+    elif per_record > previous * 1.2:
+        page_sizer["size"] = max(page_sizer["min"], int(requested_size / 1.5))
+
+def shrink_page_size(page_sizer):
+    """Halve the page size after a timeout, server error or rate limit"""
+    page_sizer["size"] = max(page_sizer["min"], page_sizer["size"] // 2)
+    page_sizer["latency"] = None
+    log.info(f"Reducing page size to {page_sizer['size']}")
+
+def is_api_failure(error):
+    """Return True for errors that count against the endpoint's health (the API did not answer the request properly)"""
+    return classify_error(error) in ("timeout", "server", "connection")
+
+def is_overload_error(error):
+    """Return True for errors that suggest the API is struggling with the request size"""
+    return classify_error(error) in ("timeout", "server", "rate_limit")
+
+def read_page(response, records_key, page, started, stream_json):
+    """Yield the page's records from the response body and complete the page's metadata, size and latency"""
+    if not stream_json:
+        data = loads(response.content)
+        page["data"] = data
+        records = data.pop(records_key, [])
+        page["bytes"] = len(response.content)
+        page["latency"] = time.time() - started
+        yield from records
+        return
+
+    # Only count time spent waiting on the response body, not time the consumer spends on each record
+    latency = time.time() - started
+    def chunks():
+        nonlocal latency
+        body = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+        while True:
+            read_started = time.time()
+            chunk = next(body, None)
+            latency += time.time() - read_started
+            if chunk is None:
+                return
+            page["bytes"] += len(chunk)
+            yield chunk
+
+    try:
+        yield from stream_records(chunks(), records_key, page["data"])
+    finally:
+        response.close()
+    page["latency"] = latency
+
+def fetch_page(client, url, params, page_sizer, records_key):
+    """Fetch a single page from the API with retry logic and return it with its size, latency, retries and wait time.
+
+    With stream_json the page's records are decoded lazily while they are iterated, and the page's data
+    (next_cursor, has_more), bytes and latency are filled in once its records have been read.
+    """
+    limiter = client["limiter"]
+    breaker = endpoint_breaker(client["breakers"], url)
+    attempts = {}
+    throttle_wait = 0.0
+    while True:
+        params["page_size"] = page_sizer["size"]
+        throttle_wait += acquire_token(limiter)
+        # Fail fast instead of retrying while the endpoint's circuit is open
+        allow_request(breaker)
+        try:
+            started = time.time()
+            response = client["session"].get(url, params=params, timeout=client["timeout"], stream=client["stream_json"])
+            learn_rate_limit(limiter, response)
+            response.raise_for_status()
+            record_outcome(breaker, True, time.time() - started)
+            break
+        except requests.exceptions.RequestException as e:
+            record_outcome(breaker, not is_api_failure(e), None)
+            if is_overload_error(e):
+                shrink_page_size(page_sizer)
+
+            # Retry according to the policy for this class of error
+            error_class = classify_error(e)
+            attempts[error_class] = attempts.get(error_class, 0) + 1
+            max_attempts = RETRY_POLICIES[error_class]["attempts"]
+            if attempts[error_class] >= max_attempts:
+                raise
+            if error_class == "rate_limit":
+                delay = throttle(limiter, e, attempts[error_class])
+            else:
+                delay = backoff_delay(error_class, attempts[error_class])
+            log.warning(f"Request failed with {error_class} error (attempt {attempts[error_class]}/{max_attempts}), retrying in {delay:.1f}s: {str(e)}")
+            time.sleep(delay)
+            throttle_wait += delay
+
+    # Recording reads the whole body up front; streaming then decodes it from memory
+    if client["journal"]:
+        journal_page(client["journal"], url, params, response, time.time() - started)
+
+    page = {
+        "data": {},
+        "bytes": 0,
+        "latency": None,
+        "page_size": params["page_size"],
+        "retries": sum(attempts.values()),
+        "throttle_wait": throttle_wait,
+        "health": health_score(breaker),
+    }
+    page["records"] = read_page(response, records_key, page, started, client["stream_json"])
+    return page
+
+def put_until_stopped(items, item, stop):
+    """Put an item on a bounded queue, waiting for room, and return False instead once the consumer has stopped reading"""
+    while not stop.is_set():
+        try:
+            items.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def prefetch_pages(client, url, params, page_sizer, prefetch_depth, records_key):
+    """Yield fetched pages while a background thread fetches up to prefetch_depth pages ahead"""
+    page_params = dict(params)
+
+    # A depth of 0 disables prefetching and fetches each page on demand, streaming its records to the consumer
+    if prefetch_depth <= 0:
+        while True:
+            page = fetch_page(client, url, page_params, page_sizer, records_key)
+            yield page
+            # The consumer has read the page's records, so its next_cursor and has_more are known
+            if not page["data"].get("has_more", False):
+                return
+            if page["data"].get("next_cursor"):
+                page_params["cursor"] = page["data"]["next_cursor"]
+
+    pages = queue.Queue(maxsize=prefetch_depth)
+    stop = threading.Event()
+
+    def fetch_loop():
+        try:
+            while True:
+                page = fetch_page(client, url, page_params, page_sizer, records_key)
+                # The next request needs this page's cursor, so read the whole page here
+                page["records"] = list(page["records"])
+                if not put_until_stopped(pages, (page, None), stop) or not page["data"].get("has_more", False):
+                    return
+                if page["data"].get("next_cursor"):
+                    page_params["cursor"] = page["data"]["next_cursor"]
+        except Exception as e:
+            # Hand the error to the consumer so it is handled like a failed request
+            put_until_stopped(pages, (None, e), stop)
+
+    fetcher = threading.Thread(target=fetch_loop, name="page-prefetcher", daemon=True)
+    fetcher.start()
+    try:
+        while True:
+            page, error = pages.get()
+            if error is not None:
+                raise error
+            yield page
+            if not page["data"].get("has_more", False):
+                return
+    finally:
+        stop.set()
@@ -0,0 +1,117 @@
+import re
+from datetime import datetime, date
+
+# Datetime strings the demo API produces that datetime.fromisoformat does not accept on every Python version,
+# such as single digit hours ("2024-08-11 0:00:00") and millisecond fractions ("2024-11-04 00:00:00.000")
+DATETIME_PATTERN = re.compile(r'(\d{4})-(\d\d)-(\d\d)(?:[ T](\d{1,2}):(\d\d)(?::(\d\d)(?:\.(\d{1,6})\d*)?)?)?$')
+DATE_PATTERN = re.compile(r'\d{4}-\d\d-\d\d$')
+
+# Integer sample values are only typed LONG for identifiers, counts and epoch timestamps. Any other number may carry
+# a fraction in a later record, which LONG could only load as null
+INTEGER_NAME_PATTERN = re.compile(r'(^|_)(id|count|epoch)$')
+
+TRUE_STRINGS = {"true", "t", "yes", "y", "1"}
+FALSE_STRINGS = {"false", "f", "no", "n", "0"}
+
+def infer_column_types(record):
+    """Derive Fivetran column types from a sample record, typing integers as DOUBLE unless they are ids or counts"""
+    columns = {}
+    for name, value in record.items():
+        if isinstance(value, bool):
+            columns[name] = "BOOLEAN"
+        elif isinstance(value, int) and INTEGER_NAME_PATTERN.search(name):
+            columns[name] = "LONG"
+        elif isinstance(value, (int, float)):
+            columns[name] = "DOUBLE"
+        elif isinstance(value, str) and DATE_PATTERN.match(value):
+            columns[name] = "NAIVE_DATE"
+        elif isinstance(value, str) and DATETIME_PATTERN.match(value):
+            columns[name] = "NAIVE_DATETIME"
+        elif isinstance(value, (dict, list)):
+            columns[name] = "JSON"
+        else:
+            columns[name] = "STRING"
+    return columns
+
+def to_boolean(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return bool(value)
+    text = str(value).strip().lower()
+    if text in TRUE_STRINGS:
+        return True
+    if text in FALSE_STRINGS:
+        return False
+    raise ValueError(f"Not a boolean: {value!r}")
+
+def to_long(value):
+    if isinstance(value, bool):
+        raise ValueError(f"Not an integer: {value!r}")
+    if isinstance(value, int):
+        return value
+    number = float(value)
+    if not number.is_integer():
+        raise ValueError(f"Not an integer: {value!r}")
+    return int(number)
+
+def to_double(value):
+    if isinstance(value, bool):
+        raise ValueError(f"Not a number: {value!r}")
+    return float(value)
+
+def to_naive_datetime(value):
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        match = DATETIME_PATTERN.match(value.strip())
+        if not match:
+            raise
+        year, month, day, hour, minute, second, fraction = match.groups()
+        return datetime(int(year), int(month), int(day), int(hour or 0), int(minute or 0), int(second or 0),
+                        int((fraction or "0").ljust(6, "0")))
+
+def to_naive_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return to_naive_datetime(value).date()
+
+def to_string(value):
+    return value if isinstance(value, str) else str(value)
+
+CONVERTERS = {
+    "BOOLEAN": to_boolean,
+    "LONG": to_long,
+    "DOUBLE": to_double,
+    "NAIVE_DATETIME": to_naive_datetime,
+    "NAIVE_DATE": to_naive_date,
+    "STRING": to_string,
+}
+
+def build_coercer(columns):
+    """Compile the column types of a table into a function that converts a record in place.
+
+    The function returns the names of the columns whose values could not be converted; those values are set to None,
+    the same way pandas' errors='coerce' would, so a single bad value does not fail the sync.
+    """
+    # Bind each column to its converter once, so per-record work is a dict lookup and a call per typed column
+    plan = tuple((name, CONVERTERS[column_type]) for name, column_type in columns.items() if column_type in CONVERTERS)
+
+    def coerce(record):
+        invalid = []
+        for name, convert in plan:
+            value = record.get(name)
+            if value is None:
+                continue
+            try:
+                record[name] = convert(value)
+            except (TypeError, ValueError, OverflowError):
+                record[name] = None
+                invalid.append(name)
+        return invalid
+
+    return coerce
@@ -0,0 +1,460 @@
+def dataset(prefix, description, columns, state_key="next_cursor", keep_last_cursor=False):
+    """Build the spec for a dataset served from the /<prefix>_data endpoint of the demo API"""
+    return {
+        "table": f"{prefix}_records",
+        "description": description,
+        "endpoint": f"/{prefix}_data",
+        "records_key": f"{prefix}_records",
+        "primary_key": ["record_id"],
+        "state_key": state_key,
+        # Keep resuming from the last cursor once the API stops returning one, instead of starting over
+        "keep_last_cursor": keep_last_cursor,
+        # Column name -> Fivetran type, declared in the schema and applied to each record at ingest
+        "columns": columns,
+    }
+
+# Column types derived from the sample record in each industry's Prompts/user_prompt.txt
+AGR_COLUMNS = {
+    "age": "DOUBLE",
+    "animal_id": "STRING",
+    "breed": "STRING",
+    "farm_id": "STRING",
+    "health_status": "STRING",
+    "humidity": "DOUBLE",
+    "last_updated_epoch": "LONG",
+    "medication_history": "STRING",
+    "precipitation": "DOUBLE",
+    "predicted_health_risk": "DOUBLE",
+    "recommended_action": "STRING",
+    "record_id": "STRING",
+    "species": "STRING",
+    "temperature": "DOUBLE",
+    "vaccination_history": "STRING",
+    "weather_data": "STRING",
+    "weight": "DOUBLE",
+}
+
+CDS_COLUMNS = {
+    "allergies": "STRING",
+    "clinical_trial_id": "STRING",
+    "cost_of_care": "DOUBLE",
+    "current_medications": "STRING",
+    "diagnosis": "STRING",
+    "family_medical_history": "STRING",
+    "genetic_data": "STRING",
+    "lab_results": "STRING",
+    "last_updated_epoch": "LONG",
+    "length_of_stay": "DOUBLE",
+    "medical_conditions": "STRING",
+    "medical_error_rate": "DOUBLE",
+    "medical_history": "STRING",
+    "medical_publication_id": "STRING",
+    "medication_adherence": "STRING",
+    "medication_cost": "DOUBLE",
+    "medication_recommendation": "STRING",
+    "medication_side_effects": "STRING",
+    "patient_id": "STRING",
+    "patient_outcome_score": "DOUBLE",
+    "patient_satisfaction": "STRING",
+    "publication_date": "NAIVE_DATE",
+    "publication_title": "STRING",
+    "readmission_risk": "DOUBLE",
+    "record_id": "STRING",
+    "total_cost_savings": "DOUBLE",
+    "treatment_outcome": "STRING",
+    "treatment_plan": "STRING",
+    "treatment_recommendation": "STRING",
+    "trial_name": "STRING",
+    "trial_status": "STRING",
+    "vital_signs": "STRING",
+}
+
+CON_COLUMNS = {
+    "actual_end_date": "NAIVE_DATE",
+    "actual_start_date": "NAIVE_DATE",
+    "cost_performance_index": "DOUBLE",
+    "critical_path_flag": "BOOLEAN",
+    "data_timestamp": "NAIVE_DATETIME",
+    "equipment_id": "STRING",
+    "equipment_status": "STRING",
+    "equipment_utilization_rate": "DOUBLE",
+    "last_updated_epoch": "LONG",
+    "material_delivery_date": "NAIVE_DATE",
+    "material_delivery_status": "STRING",
+    "percent_complete": "DOUBLE",
+    "precipitation_probability": "DOUBLE",
+    "project_id": "STRING",
+    "project_name": "STRING",
+    "record_id": "STRING",
+    "resource_availability": "DOUBLE",
+    "resource_cost_per_hour": "DOUBLE",
+    "resource_id": "STRING",
+    "resource_type": "STRING",
+    "risk_score": "DOUBLE",
+    "schedule_performance_index": "DOUBLE",
+    "scheduled_end_date": "NAIVE_DATE",
+    "scheduled_start_date": "NAIVE_DATE",
+    "supplier_id": "STRING",
+    "task_id": "STRING",
+    "task_name": "STRING",
+    "task_status": "STRING",
+    "temperature_fahrenheit": "DOUBLE",
+    "weather_condition": "STRING",
+    "wind_speed_mph": "DOUBLE",
+}
+
+CPG_COLUMNS = {
+    "average_order_value": "DOUBLE",
+    "customer_id": "STRING",
+    "customer_ltv": "DOUBLE",
+    "customer_satisfaction_rate": "DOUBLE",
+    "customer_segment": "STRING",
+    "demand_forecast": "DOUBLE",
+    "inventory_level": "DOUBLE",
+    "inventory_turnover": "DOUBLE",
+    "last_updated_epoch": "LONG",
+    "order_date": "NAIVE_DATE",
+    "order_frequency": "DOUBLE",
+    "order_id": "STRING",
+    "order_status": "STRING",
+    "order_total": "DOUBLE",
+    "overstock_rate": "DOUBLE",
+    "price_elasticity": "DOUBLE",
+    "price_optimization_date": "NAIVE_DATE",
+    "price_optimization_flag": "BOOLEAN",
+    "price_optimization_recommendation": "STRING",
+    "price_optimization_result": "STRING",
+    "product_category": "STRING",
+    "product_id": "STRING",
+    "product_price": "DOUBLE",
+    "product_rating": "DOUBLE",
+    "product_review_count": "LONG",
+    "product_subcategory": "STRING",
+    "record_id": "STRING",
+    "revenue_growth_rate": "DOUBLE",
+    "stockout_rate": "DOUBLE",
+}
+
+FPR_COLUMNS = {
+    "account_balance": "DOUBLE",
+    "customer_churn_probability": "DOUBLE",
+    "customer_email": "STRING",
+    "customer_id": "STRING",
+    "customer_lifecycle_stage": "STRING",
+    "customer_lifecycle_stage_transition_date": "NAIVE_DATE",
+    "customer_name": "STRING",
+    "customer_product_affinity": "DOUBLE",
+    "customer_product_affinity_trend": "STRING",
+    "customer_product_interests": "STRING",
+    "customer_product_usage": "STRING",
+    "customer_product_usage_trend": "STRING",
+    "customer_satisfaction_score": "DOUBLE",
+    "customer_segment": "STRING",
+    "customer_transaction_count": "LONG",
+    "customer_transaction_value": "DOUBLE",
+    "last_updated_epoch": "LONG",
+    "product_id": "STRING",
+    "product_name": "STRING",
+    "product_recommendation": "STRING",
+    "product_recommendation_date": "NAIVE_DATE",
+    "product_recommendation_status": "STRING",
+    "product_sales_amount": "DOUBLE",
+    "product_sales_date": "NAIVE_DATE",
+    "product_terms": "STRING",
+    "product_type": "STRING",
+    "recommendation_score": "DOUBLE",
+    "record_id": "STRING",
+    "transaction_history": "STRING",
+}
+
+FTS_COLUMNS = {
+    "customer_id": "STRING",
+    "downtime_hours": "DOUBLE",
+    "equipment_id": "STRING",
+    "erp_order_id": "STRING",
+    "failure_rate": "DOUBLE",
+    "last_updated_epoch": "LONG",
+    "log_date": "NAIVE_DATE",
+    "log_description": "STRING",
+    "maintenance_cost": "DOUBLE",
+    "maintenance_status": "STRING",
+    "maintenance_type": "STRING",
+    "record_id": "STRING",
+    "summarization_time_saved": "DOUBLE",
+    "summarized_log": "STRING",
+    "technician_id": "STRING",
+}
+
+HED_COLUMNS = {
+    "academic_standing": "STRING",
+    "advisor_id": "STRING",
+    "assignment_submissions": "DOUBLE",
+    "at_risk_flag": "BOOLEAN",
+    "avg_assignment_score": "DOUBLE",
+    "course_completion_rate": "DOUBLE",
+    "credit_hours_attempted": "DOUBLE",
+    "credit_hours_earned": "DOUBLE",
+    "current_gpa": "DOUBLE",
+    "discussion_posts": "DOUBLE",
+    "engagement_score": "DOUBLE",
+    "enrollment_date": "NAIVE_DATETIME",
+    "financial_aid_amount": "DOUBLE",
+    "intervention_count": "LONG",
+    "last_login_date": "NAIVE_DATETIME",
+    "last_updated": "NAIVE_DATETIME",
+    "last_updated_epoch": "LONG",
+    "major_code": "STRING",
+    "plagiarism_incidents": "DOUBLE",
+    "record_id": "STRING",
+    "student_id": "STRING",
+    "total_course_views": "DOUBLE",
+    "writing_quality_score": "DOUBLE",
+}
+
+HPT_COLUMNS = {
+    "activity_preferences": "STRING",
+    "event_availability_status": "STRING",
+    "event_category": "STRING",
+    "event_id": "STRING",
+    "event_name": "STRING",
+    "event_start_datetime": "NAIVE_DATETIME",
+    "guest_id": "STRING",
+    "guest_preference_score": "DOUBLE",
+    "guest_sentiment_rating": "DOUBLE",
+    "last_updated_epoch": "LONG",
+    "preferred_cuisine_types": "STRING",
+    "recommendation_timestamp": "NAIVE_DATETIME",
+    "record_id": "STRING",
+    "temperature_fahrenheit": "DOUBLE",
+    "transportation_cost_estimate": "DOUBLE",
+    "transportation_eta_minutes": "DOUBLE",
+    "venue_id": "STRING",
+    "venue_latitude": "DOUBLE",
+    "venue_longitude": "DOUBLE",
+    "venue_name": "STRING",
+    "venue_price_level": "DOUBLE",
+    "venue_rating": "DOUBLE",
+    "weather_condition": "STRING",
+}
+
+ICP_COLUMNS = {
+    "claim_amount": "DOUBLE",
+    "claim_category": "STRING",
+    "claim_date": "NAIVE_DATE",
+    "claim_description": "STRING",
+    "claim_id": "STRING",
+    "claim_outcome": "STRING",
+    "claim_outcome_confidence": "DOUBLE",
+    "claim_outcome_date": "NAIVE_DATE",
+    "claim_outcome_probability": "DOUBLE",
+    "claim_processing_duration": "DOUBLE",
+    "claim_processing_end_date": "NAIVE_DATE",
+    "claim_processing_error": "BOOLEAN",
+    "claim_processing_error_reduction": "DOUBLE",
+    "claim_processing_notes": "STRING",
+    "claim_processing_start_date": "NAIVE_DATE",
+    "claim_processing_time": "DOUBLE",
+    "claim_processing_time_reduction": "DOUBLE",
+    "claim_status": "STRING",
+    "claim_status_history": "STRING",
+    "claim_subcategory": "STRING",
+    "claim_type": "STRING",
+    "customer_email": "STRING",
+    "customer_id": "STRING",
+    "customer_interaction_history": "STRING",
+    "customer_name": "STRING",
+    "customer_satisfaction_rating": "DOUBLE",
+    "customer_satisfaction_rating_improvement": "DOUBLE",
+    "customer_segment": "STRING",
+    "last_updated_epoch": "LONG",
+    "operational_cost": "DOUBLE",
+    "operational_cost_reduction": "DOUBLE",
+    "policy_effective_date": "NAIVE_DATE",
+    "policy_id": "STRING",
+    "record_id": "STRING",
+}
+
+MET_COLUMNS = {
+    "age_range": "STRING",
+    "avg_session_duration": "DOUBLE",
+    "content_preferences": "STRING",
+    "conversion_rate": "DOUBLE",
+    "customer_id": "STRING",
+    "customer_segment": "STRING",
+    "email_address": "STRING",
+    "engagement_trend": "STRING",
+    "first_name": "STRING",
+    "gender": "STRING",
+    "last_name": "STRING",
+    "last_purchase_date": "NAIVE_DATETIME",
+    "last_updated_epoch": "LONG",
+    "lead_score": "DOUBLE",
+    "location_city": "STRING",
+    "location_country": "STRING",
+    "predicted_churn_risk": "DOUBLE",
+    "purchase_frequency": "DOUBLE",
+    "recommended_content_type": "STRING",
+    "record_id": "STRING",
+    "record_timestamp": "NAIVE_DATETIME",
+    "social_engagement_score": "DOUBLE",
+    "social_media_followers": "DOUBLE",
+    "total_purchase_value": "DOUBLE",
+    "website_sessions": "DOUBLE",
+}
+
+MSO_COLUMNS = {
+    "cad_file_name": "STRING",
+    "cad_system": "STRING",
+    "cost_savings": "DOUBLE",
+    "density": "DOUBLE",
+    "designer_experience": "DOUBLE",
+    "designer_id": "STRING",
+    "designer_name": "STRING",
+    "designer_skill_level": "STRING",
+    "last_updated_epoch": "LONG",
+    "material_cost": "DOUBLE",
+    "material_id": "STRING",
+    "material_name": "STRING",
+    "material_optimization_date": "NAIVE_DATE",
+    "material_optimization_recommendation": "STRING",
+    "material_optimization_score": "DOUBLE",
+    "material_selection_date": "NAIVE_DATE",
+    "material_selection_recommendation": "STRING",
+    "material_selection_score": "DOUBLE",
+    "material_waste": "DOUBLE",
+    "material_weight": "DOUBLE",
+    "performance_improvement": "DOUBLE",
+    "poissons_ratio": "DOUBLE",
+    "product_description": "STRING",
+    "product_id": "STRING",
+    "product_lifecycle_stage": "STRING",
+    "product_lifecycle_status": "STRING",
+    "product_name": "STRING",
+    "product_performance": "DOUBLE",
+    "record_id": "STRING",
+    "waste_reduction": "DOUBLE",
+    "weight_reduction": "DOUBLE",
+    "youngs_modulus": "DOUBLE",
+}
+
+PHR_COLUMNS = {
+    "disease_area": "STRING",
+    "dropout_rate": "DOUBLE",
+    "enrollment_date": "NAIVE_DATE",
+    "enrollment_rate": "DOUBLE",
+    "last_updated_epoch": "LONG",
+    "patient_age": "DOUBLE",
+    "patient_gender": "STRING",
+    "patient_id": "STRING",
+    "protocol_amendment_date": "NAIVE_DATE",
+    "protocol_id": "STRING",
+    "record_id": "STRING",
+    "regulatory_approval_status": "STRING",
+    "site_id": "STRING",
+    "site_name": "STRING",
+    "sponsor_name": "STRING",
+    "trial_id": "STRING",
+    "trial_name": "STRING",
+    "trial_status": "STRING",
+}
+
+RDP_COLUMNS = {
+    "average_order_value": "DOUBLE",
+    "customer_id": "STRING",
+    "customer_lifetime_value": "DOUBLE",
+    "customer_satisfaction_rate": "DOUBLE",
+    "customer_segment": "STRING",
+    "demand_forecast": "DOUBLE",
+    "inventory_level": "DOUBLE",
+    "inventory_turnover": "DOUBLE",
+    "last_updated_epoch": "LONG",
+    "order_date": "NAIVE_DATE",
+    "order_frequency": "DOUBLE",
+    "order_id": "STRING",
+    "order_status": "STRING",
+    "order_total": "DOUBLE",
+    "overstock_rate": "DOUBLE",
+    "price_elasticity": "DOUBLE",
+    "price_optimization_date": "NAIVE_DATE",
+    "price_optimization_flag": "BOOLEAN",
+    "price_optimization_recommendation": "STRING",
+    "price_optimization_result": "STRING",
+    "product_category": "STRING",
+    "product_id": "STRING",
+    "product_price": "DOUBLE",
+    "product_rating": "DOUBLE",
+    "product_review_count": "LONG",
+    "product_subcategory": "STRING",
+    "record_id": "STRING",
+    "revenue_growth_rate": "DOUBLE",
+    "stockout_rate": "DOUBLE",
+}
+
+SPL_COLUMNS = {
+    "actual_sales_units": "DOUBLE",
+    "adjusted_demand_forecast": "DOUBLE",
+    "baseline_demand_forecast": "DOUBLE",
+    "category_growth_rate": "DOUBLE",
+    "competitor_price_index": "DOUBLE",
+    "consumer_confidence_index": "DOUBLE",
+    "current_inventory_level": "DOUBLE",
+    "economic_indicator_gdp": "DOUBLE",
+    "forecast_accuracy_mape": "DOUBLE",
+    "forecast_date": "NAIVE_DATETIME",
+    "forecast_horizon_days": "DOUBLE",
+    "last_updated_epoch": "LONG",
+    "location_code": "STRING",
+    "market_share_percent": "DOUBLE",
+    "pos_transaction_count": "LONG",
+    "product_sku": "STRING",
+    "promotion_discount_percent": "DOUBLE",
+    "promotional_activity_flag": "BOOLEAN",
+    "record_id": "STRING",
+    "sales_rep_adjustment": "DOUBLE",
+    "seasonal_index": "DOUBLE",
+    "stockout_indicator": "BOOLEAN",
+}
+
+TLC_COLUMNS = {
+    "account_created_date": "NAIVE_DATETIME",
+    "account_name": "STRING",
+    "churn_risk_probability": "DOUBLE",
+    "customer_id": "STRING",
+    "customer_tier": "STRING",
+    "data_consumption_gb": "DOUBLE",
+    "engagement_score": "DOUBLE",
+    "last_interaction_date": "NAIVE_DATETIME",
+    "last_updated_epoch": "LONG",
+    "last_updated_timestamp": "NAIVE_DATETIME",
+    "monthly_usage_minutes": "DOUBLE",
+    "network_performance_rating": "DOUBLE",
+    "payment_status": "STRING",
+    "record_id": "STRING",
+    "retention_campaign_active": "BOOLEAN",
+    "service_quality_score": "DOUBLE",
+    "social_mentions_count": "LONG",
+    "social_sentiment_score": "DOUBLE",
+    "support_tickets_count": "LONG",
+    "total_contract_value": "DOUBLE",
+    "usage_trend_30d": "STRING",
+}
+
+# Every dataset the engine can sync, keyed by destination table name.
+# FPR and FTS keep the state layout their connectors shipped with so existing deployments resume where they left off.
+DATASETS = {
+    "agr_records": dataset("agr", "Agriculture Livestock Health Monitoring", AGR_COLUMNS),
+    "cds_records": dataset("cds", "Healthcare Clinical Decision Support", CDS_COLUMNS),
+    "con_records": dataset("con", "Construction Project Scheduling", CON_COLUMNS),
+    "cpg_records": dataset("cpg", "Consumer Packaged Goods", CPG_COLUMNS),
+    "fpr_records": dataset("fpr", "Financial Services Product Recommendation Matching", FPR_COLUMNS, keep_last_cursor=True),
+    "fts_records": dataset("fts", "Oil and Gas Field Technician Summarization", FTS_COLUMNS, state_key="cursor", keep_last_cursor=True),
+    "hed_records": dataset("hed", "HigherEd Freshman Retention", HED_COLUMNS),
+    "hpt_records": dataset("hpt", "Hospitality Guest Services Experience", HPT_COLUMNS),
+    "icp_records": dataset("icp", "Insurance Claims Processing", ICP_COLUMNS),
+    "met_records": dataset("met", "Media Entertainment Audience Insights", MET_COLUMNS),
+    "mso_records": dataset("mso", "Manufacturing Material Selection Optimization", MSO_COLUMNS),
+    "phr_records": dataset("phr", "Pharma Clinical Trial Design", PHR_COLUMNS),
+    "rdp_records": dataset("rdp", "Retail Dynamic Pricing", RDP_COLUMNS),
+    "spl_records": dataset("spl", "Supply Chain Demand Forecasting", SPL_COLUMNS),
+    "tlc_records": dataset("tlc", "Telco Churn Prevention", TLC_COLUMNS),
+}
@@ -0,0 +1,101 @@
+import json
+import codecs
+
+# Use the fastest JSON decoder that is installed for whole response bodies, falling back to the standard library
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    try:
+        import msgspec
+        loads = msgspec.json.decode
+    except ImportError:
+        loads = json.loads
+
+# Streaming uses the standard library's C scanner, which can decode one value at an offset of a partial buffer
+DECODER = json.JSONDecoder()
+WHITESPACE = " \t\n\r"
+
+# Processed text is dropped from the buffer once this many characters have accumulated
+COMPACT_AFTER = 64 * 1024
+
+def stream_records(chunks, records_key, meta):
+    """Yield each record of the records_key array as soon as it has been read from chunks.
+
+    The other top-level values of the response object (next_cursor, has_more, ...) are decoded into meta,
+    which is complete once the generator is exhausted. Only the unread part of the body is held as text.
+    """
+    chunks = iter(chunks)
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+
+    def fill():
+        # Append the next chunk to the buffer, returning False at the end of the body
+        nonlocal buf, pos
+        if pos > COMPACT_AFTER:
+            buf = buf[pos:]
+            pos = 0
+        for chunk in chunks:
+            text = utf8.decode(chunk)
+            if text:
+                buf += text
+                return True
+        text = utf8.decode(b"", final=True)
+        buf += text
+        return bool(text)
+
+    def next_char():
+        # Skip whitespace and return the next significant character without consuming it
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in WHITESPACE:
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if not fill():
+                raise ValueError("Response ended before the JSON object was complete")
+
+    def expect(chars):
+        nonlocal pos
+        char = next_char()
+        if char not in chars:
+            raise ValueError(f"Unexpected {char!r} at offset {pos} of the response")
+        pos += 1
+        return char
+
+    def value():
+        # Decode the value at pos, reading more of the body until it is complete
+        nonlocal pos
+        next_char()
+        while True:
+            try:
+                decoded, end = DECODER.raw_decode(buf, pos)
+                # A value ending at the end of the buffer may be a number that continues in the next chunk
+                if end < len(buf) or not fill():
+                    pos = end
+                    return decoded
+            except json.JSONDecodeError:
+                if not fill():
+                    raise
+
+    expect("{")
+    if next_char() == "}":
+        pos += 1
+        return
+    while True:
+        key = value()
+        expect(":")
+        if key == records_key and next_char() == "[":
+            pos += 1
+            if next_char() == "]":
+                pos += 1
+            else:
+                while True:
+                    yield value()
+                    if expect(",]") == "]":
+                        break
+        else:
+            meta[key] = value()
+        if expect(",}") == "}":
+            return
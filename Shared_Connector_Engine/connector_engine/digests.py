@@ -0,0 +1,67 @@
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+
+DEFAULT_DIGEST_STORE_PATH = os.path.join("files", "record_digests.db")
+
+def open_digest_store(configuration):
+    """Open the per-record content digest store, or return None when change_detection is disabled"""
+    if configuration.get('change_detection', 'false').lower() != 'true':
+        return None
+
+    path = configuration.get('digest_store_path', DEFAULT_DIGEST_STORE_PATH)
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # One connection shared by the dataset workers (lookups) and the main thread (saves), serialized by the lock
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS record_digests ("
+        "table_name TEXT NOT NULL, record_key TEXT NOT NULL, digest BLOB NOT NULL, "
+        "PRIMARY KEY (table_name, record_key)) WITHOUT ROWID"
+    )
+    conn.commit()
+    return {"conn": conn, "lock": threading.Lock()}
+
+def record_key(record, primary_key):
+    """Return the record's primary key as a single string"""
+    if len(primary_key) == 1:
+        return str(record[primary_key[0]])
+    return json.dumps([record[key] for key in primary_key], default=str)
+
+def record_digest(record):
+    """Return a 16 byte digest of the record's content, independent of key order"""
+    content = json.dumps(record, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+def stored_digest(store, table, key):
+    """Return the digest saved for the record at the last checkpoint, or None for a new record"""
+    with store["lock"]:
+        row = store["conn"].execute(
+            "SELECT digest FROM record_digests WHERE table_name = ? AND record_key = ?", (table, key)
+        ).fetchone()
+    return row[0] if row else None
+
+def save_digests(store, table, digests):
+    """Save the digests of records whose upserts have been checkpointed"""
+    with store["lock"]:
+        store["conn"].executemany(
+            "INSERT OR REPLACE INTO record_digests (table_name, record_key, digest) VALUES (?, ?, ?)",
+            [(table, key, digest) for key, digest in digests],
+        )
+        store["conn"].commit()
+
+def clear_digests(store, table):
+    """Forget every digest of a table, so a full re-sync upserts all of its records again"""
+    with store["lock"]:
+        store["conn"].execute("DELETE FROM record_digests WHERE table_name = ?", (table,))
+        store["conn"].commit()
+
+def close_digest_store(store):
+    if store:
+        with store["lock"]:
+            store["conn"].close()
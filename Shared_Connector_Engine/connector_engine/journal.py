@@ -0,0 +1,118 @@
+import os
+import gzip
+import json
+import time
+import threading
+import requests
+from urllib.parse import urlparse
+from fivetran_connector_sdk import Logging as log
+from connector_engine.decoding import loads, stream_records
+
+DEFAULT_JOURNAL_PATH = os.path.join("files", "page_journal.jsonl.gz")
+
+def journal_mode(configuration):
+    """Return "record" to write every page response to the journal, "replay" to sync from it offline, or None"""
+    mode = configuration.get('page_journal', 'off').lower()
+    return mode if mode in ("record", "replay") else None
+
+def journal_path(configuration):
+    return configuration.get('journal_path', DEFAULT_JOURNAL_PATH)
+
+def page_key(url, params):
+    """Identify a page by endpoint and request parameters; the page size is left out so replays match any setting"""
+    query = sorted((key, str(value)) for key, value in params.items() if key != "page_size")
+    return json.dumps([urlparse(url).path, query])
+
+def open_journal(configuration):
+    """Open the page journal for appending when page_journal is record, or return None"""
+    if journal_mode(configuration) != "record":
+        return None
+    path = journal_path(configuration)
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    log.info(f"Recording page responses to {path}")
+    # Each sync appends a new gzip member, so earlier recordings stay readable as one file
+    return {"file": gzip.open(path, "ab"), "lock": threading.Lock(), "path": path}
+
+def journal_page(journal, url, params, response, latency):
+    """Append one page response, with the parameters that requested it, to the journal"""
+    entry = {
+        "key": page_key(url, params),
+        "cursor": params.get("cursor"),
+        "page_size": params.get("page_size"),
+        "status": response.status_code,
+        "headers": dict(response.headers),
+        "latency": latency,
+        "recorded_at": time.time(),
+        "body": response.content.decode("utf-8"),
+    }
+    line = (json.dumps(entry) + "\n").encode("utf-8")
+    with journal["lock"]:
+        journal["file"].write(line)
+
+def close_journal(journal):
+    if journal:
+        with journal["lock"]:
+            journal["file"].close()
+
+def load_journal(path):
+    """Read a journal into a page lookup; the latest recording of a page wins"""
+    pages = {}
+    try:
+        with gzip.open(path, "rb") as f:
+            for line in f:
+                entry = json.loads(line)
+                pages[entry["key"]] = entry
+    except FileNotFoundError:
+        log.severe(f"Page journal {path} not found, record one first with page_journal set to record")
+    except (EOFError, gzip.BadGzipFile, json.JSONDecodeError):
+        # A sync that was killed mid-write leaves a truncated last member; keep what was written before it
+        log.warning(f"Page journal {path} ends with an incomplete entry, replaying the {len(pages)} complete pages")
+    return pages
+
+def create_replay_client(configuration):
+    """Create a client that serves pages from the journal instead of the API"""
+    path = journal_path(configuration)
+    pages = load_journal(path)
+    log.info(f"Replaying {len(pages)} recorded pages from {path}, no requests will be sent")
+    return {
+        "pages": pages,
+        "limiter": None,
+        "timeout": None,
+        "stream_json": configuration.get('stream_json', 'true').lower() == 'true',
+        "engine": "replay",
+    }
+
+def replay_page(client, url, params, page_sizer, records_key):
+    """Return the recorded page for the request in the same form as fetch_page, without touching the network"""
+    entry = client["pages"].get(page_key(url, params))
+    if entry is None:
+        raise requests.exceptions.ConnectionError(f"No recorded page for {urlparse(url).path} with cursor {params.get('cursor')}")
+
+    body = entry["body"].encode("utf-8")
+    page = {
+        "data": {},
+        "bytes": len(body),
+        # The recorded latency, so metrics and page sizing see what the API did at recording time
+        "latency": entry["latency"],
+        "page_size": entry["page_size"] or page_sizer["size"],
+        "retries": 0,
+        "throttle_wait": 0.0,
+    }
+    if client["stream_json"]:
+        page["records"] = stream_records([body], records_key, page["data"])
+    else:
+        page["data"] = loads(body)
+        page["records"] = page["data"].pop(records_key, [])
+    return page
+
+def replay_pages(client, url, params, page_sizer, prefetch_depth, records_key):
+    """Yield the recorded pages of a cursor chain in order, like prefetch_pages does for live requests"""
+    page_params = dict(params)
+    while True:
+        page = replay_page(client, url, page_params, page_sizer, records_key)
+        yield page
+        if not page["data"].get("has_more", False):
+            return
+        if page["data"].get("next_cursor"):
+            page_params["cursor"] = page["data"]["next_cursor"]
@@ -0,0 +1,79 @@
+import uuid
+from datetime import datetime, timezone
+
+METRICS_TABLE = "connector_sync_metrics"
+
+# One row per page fetched (row_type "page") and one per dataset and sync (row_type "summary", page_number 0)
+METRICS_COLUMNS = {
+    "sync_id": "STRING",
+    "table_name": "STRING",
+    "page_number": "LONG",
+    "row_type": "STRING",
+    "recorded_at": "UTC_DATETIME",
+    "page_size": "LONG",
+    "records": "LONG",
+    "skipped_records": "LONG",
+    "bytes": "LONG",
+    "latency_ms": "DOUBLE",
+    "retries": "LONG",
+    "throttle_wait_seconds": "DOUBLE",
+    "health_score": "DOUBLE",
+    "cursor": "STRING",
+    "checkpointed": "BOOLEAN",
+    "pages": "LONG",
+    "checkpoints": "LONG",
+    "duration_seconds": "DOUBLE",
+    "status": "STRING",
+}
+
+def sync_metrics_enabled(configuration):
+    """Return True when the connector upserts its own per-page and per-sync metrics"""
+    return configuration.get('sync_metrics', 'true').lower() == 'true'
+
+def metrics_schema():
+    return {"table": METRICS_TABLE, "primary_key": ["sync_id", "table_name", "page_number"], "columns": dict(METRICS_COLUMNS)}
+
+def new_sync_id():
+    return str(uuid.uuid4())
+
+def page_metrics(sync_id, table, page_number, page, records, skipped, cursor, checkpointed):
+    """Build the metrics row of one page once its records have been read"""
+    return {
+        "sync_id": sync_id,
+        "table_name": table,
+        "page_number": page_number,
+        "row_type": "page",
+        "recorded_at": datetime.now(timezone.utc),
+        "page_size": page["page_size"],
+        "records": records,
+        "skipped_records": skipped,
+        "bytes": page["bytes"],
+        "latency_ms": round(page["latency"] * 1000, 3) if page["latency"] is not None else None,
+        "retries": page.get("retries", 0),
+        "throttle_wait_seconds": round(page.get("throttle_wait", 0.0), 3),
+        "health_score": page.get("health"),
+        "cursor": cursor,
+        "checkpointed": checkpointed,
+    }
+
+def summary_metrics(sync_id, table, totals, cursor, duration, status):
+    """Build the summary row of one dataset's sync from the page totals"""
+    return {
+        "sync_id": sync_id,
+        "table_name": table,
+        "page_number": 0,
+        "row_type": "summary",
+        "recorded_at": datetime.now(timezone.utc),
+        "records": totals["records"],
+        "skipped_records": totals["skipped"],
+        "bytes": totals["bytes"],
+        "latency_ms": round(totals["latency"] * 1000, 3),
+        "retries": totals["retries"],
+        "throttle_wait_seconds": round(totals["throttle_wait"], 3),
+        "health_score": totals["health"],
+        "cursor": cursor,
+        "pages": totals["pages"],
+        "checkpoints": totals["checkpoints"],
+        "duration_seconds": round(duration, 3),
+        "status": status,
+    }
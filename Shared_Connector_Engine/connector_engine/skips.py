@@ -0,0 +1,90 @@
+import json
+import random
+from datetime import datetime, timezone
+from fivetran_connector_sdk import Logging as log
+from connector_engine.digests import record_digest
+
+QUARANTINE_TABLE = "connector_quarantine"
+
+QUARANTINE_COLUMNS = {
+    "table_name": "STRING",
+    "record_hash": "STRING",
+    "reason": "STRING",
+    "payload": "STRING",
+    "quarantined_at": "UTC_DATETIME",
+}
+
+# Longest payload kept in a log sample; quarantined rows keep the whole record
+SAMPLE_PAYLOAD_CHARS = 300
+
+def quarantine_enabled(configuration):
+    """Return True when skipped records are upserted into the quarantine table"""
+    return configuration.get('quarantine_skipped', 'false').lower() == 'true'
+
+def quarantine_schema():
+    return {"table": QUARANTINE_TABLE, "primary_key": ["table_name", "record_hash"], "columns": dict(QUARANTINE_COLUMNS)}
+
+def skip_reason(record, primary_key):
+    """Return why a record cannot be upserted, or None for a valid record"""
+    if not isinstance(record, dict):
+        return "not_an_object"
+    if any(record.get(key) is None for key in primary_key):
+        return "missing_primary_key"
+    return None
+
+def skip_reporter(table, sample_size=3):
+    """Create the skip counters of one dataset's sync"""
+    return {"table": table, "sample_size": sample_size, "page": {}, "total": {}, "seen": 0, "sample": [], "rng": random.Random()}
+
+def payload_text(record):
+    return json.dumps(record, sort_keys=True, default=str)
+
+def sample_text(reason, record):
+    text = payload_text(record)
+    if len(text) > SAMPLE_PAYLOAD_CHARS:
+        text = text[:SAMPLE_PAYLOAD_CHARS] + "..."
+    return f"{reason}: {text}"
+
+def report_skip(reporter, reason, record):
+    """Count a skipped record and keep it in a fixed-size uniform sample of the page's skipped records"""
+    reporter["page"][reason] = reporter["page"].get(reason, 0) + 1
+    reporter["seen"] += 1
+    # Reservoir sampling, so the sample stays representative without serializing every bad record
+    sample = reporter["sample"]
+    if len(sample) < reporter["sample_size"]:
+        sample.append(sample_text(reason, record))
+    else:
+        slot = reporter["rng"].randrange(reporter["seen"])
+        if slot < len(sample):
+            sample[slot] = sample_text(reason, record)
+
+def quarantine_row(table, reason, record):
+    """Build the quarantine table row of a skipped record"""
+    return {
+        "table_name": table,
+        "record_hash": record_digest(record).hex(),
+        "reason": reason,
+        "payload": payload_text(record),
+        "quarantined_at": datetime.now(timezone.utc),
+    }
+
+def flush_skips(reporter):
+    """Log one warning summarizing the page's skipped records, then start counting the next page"""
+    if not reporter["page"]:
+        return 0
+    skipped = sum(reporter["page"].values())
+    counts = ", ".join(f"{reason} ({count})" for reason, count in sorted(reporter["page"].items()))
+    samples = "; ".join(reporter["sample"])
+    log.warning(f"{reporter['table']}: skipped {skipped} records in this page: {counts}. Sample: {samples}")
+    for reason, count in reporter["page"].items():
+        reporter["total"][reason] = reporter["total"].get(reason, 0) + count
+    reporter["page"] = {}
+    reporter["seen"] = 0
+    reporter["sample"] = []
+    return skipped
+
+def skip_totals(reporter):
+    """Return the sync's skipped record counts by reason, as text, or None when nothing was skipped"""
+    if not reporter["total"]:
+        return None
+    return ", ".join(f"{reason} ({count})" for reason, count in sorted(reporter["total"].items()))
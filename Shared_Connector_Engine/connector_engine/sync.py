@@ -0,0 +1,517 @@
+import requests
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from fivetran_connector_sdk import Operations as op
+from fivetran_connector_sdk import Logging as log
+from connector_engine.coercion import build_coercer
+from connector_engine.digests import open_digest_store, close_digest_store, record_key, record_digest, stored_digest, save_digests, clear_digests
+from connector_engine.client import RETRY_POLICIES, create_client, page_size_controller, adjust_page_size, prefetch_pages, put_until_stopped
+from connector_engine.async_client import http_engine, create_async_client, close_async_client, async_prefetch_pages
+from connector_engine.breaker import CircuitOpenError, endpoint_breaker, health_score
+from connector_engine.journal import journal_mode, open_journal, close_journal, create_replay_client, replay_pages
+from connector_engine.backfill import backfill_partitions, build_backfill_state, partition_pages
+from connector_engine.skips import QUARANTINE_TABLE, quarantine_enabled, quarantine_schema, skip_reason, skip_reporter, report_skip, quarantine_row, flush_skips, skip_totals
+from connector_engine.metrics import METRICS_TABLE, sync_metrics_enabled, metrics_schema, new_sync_id, page_metrics, summary_metrics
+
+EVENT_QUEUE_SIZE = 1000
+
+def build_schema(configuration, datasets):
+    """Define the table schema for each dataset from its spec"""
+    # Validate configuration
+    api_key = configuration.get('api_key')
+    if not api_key:
+        log.severe("API key is missing from configuration")
+        return []
+
+    tables = []
+    for dataset in datasets:
+        table = {"table": dataset["table"], "primary_key": dataset["primary_key"]}
+        # Declare the column types the spec lists, Fivetran infers the rest
+        if typed_schema(configuration) and dataset["columns"]:
+            table["columns"] = dict(dataset["columns"])
+        tables.append(table)
+
+    # Records that could not be upserted, kept for inspection
+    if quarantine_enabled(configuration):
+        tables.append(quarantine_schema())
+
+    # The connector's own per-page and per-sync measurements
+    if sync_metrics_enabled(configuration):
+        tables.append(metrics_schema())
+    return tables
+
+def typed_schema(configuration):
+    """Return True when column types are declared in the schema and applied to records at ingest"""
+    return configuration.get('typed_schema', 'true').lower() == 'true'
+
+def record_watermark(record, watermark_field):
+    """Return the record's watermark value as a number, or None when it is missing or not numeric"""
+    if not watermark_field:
+        return None
+    value = record.get(watermark_field)
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def build_state(cursor_key, cursor, watermark, pending_watermark, has_more, page_size):
+    """Build the checkpoint state, promoting the pending watermark once the cursor chain is complete"""
+    if not has_more:
+        return {cursor_key: cursor, "watermark": pending_watermark if pending_watermark is not None else watermark, "page_size": page_size}
+    return {cursor_key: cursor, "watermark": watermark, "pending_watermark": pending_watermark, "page_size": page_size}
+
+def sync_budget(configuration):
+    """Read the per-sync time, record and byte limits from the configuration (0 means unlimited)"""
+    return {
+        "seconds": float(configuration.get('max_sync_seconds', '1800')),
+        "records": int(configuration.get('max_sync_records', '0')),
+        "bytes": int(configuration.get('max_sync_bytes', '0')),
+        "started": time.time(),
+    }
+
+def budget_exhausted(budget, record_count, byte_count):
+    """Return which sync budget limit has been reached, or None while the sync can continue"""
+    if budget["seconds"] and time.time() - budget["started"] >= budget["seconds"]:
+        return "time"
+    if budget["records"] and record_count >= budget["records"]:
+        return "records"
+    if budget["bytes"] and byte_count >= budget["bytes"]:
+        return "bytes"
+    return None
+
+def checkpoint_policy(configuration):
+    """Read how often to checkpoint: after this many records, seconds or bytes (all 0 checkpoints every page)"""
+    return {
+        "records": int(configuration.get('checkpoint_every_records', '0')),
+        "seconds": float(configuration.get('checkpoint_every_seconds', '0')),
+        "bytes": int(configuration.get('checkpoint_every_bytes', '0')),
+    }
+
+def checkpoint_due(policy, since_checkpoint):
+    """Return True when the pages read since the last checkpoint call for a new one"""
+    if not (policy["records"] or policy["seconds"] or policy["bytes"]):
+        return True
+    if policy["records"] and since_checkpoint["records"] >= policy["records"]:
+        return True
+    if policy["seconds"] and time.monotonic() - since_checkpoint["started"] >= policy["seconds"]:
+        return True
+    return bool(policy["bytes"]) and since_checkpoint["bytes"] >= policy["bytes"]
+
+def sync_dataset(configuration, client, dataset, state, budget, digest_store=None, sync_id=None):
+    """Sync one dataset, yielding ("upsert", record), ("digests", [(key, digest)]) and ("checkpoint", dataset_state) events.
+
+    A "digests" event carries the content digests of the records upserted since the last checkpoint; they are saved
+    to the digest store only once the checkpoint that follows it has been emitted. When a sync_id is given, a
+    ("metrics", row) event follows every page and one summary row ends the sync. With quarantine_skipped enabled,
+    each record that cannot be upserted is yielded as a ("quarantine", row) event instead.
+    """
+    table = dataset["table"]
+    cursor_key = dataset["state_key"]
+    base_url = configuration.get('base_url')
+    page_sizer = page_size_controller(configuration, state)
+    # A page never asks for more records than the record budget, so the first page of every sync fits in it
+    if budget["records"]:
+        page_sizer["max"] = min(page_sizer["max"], budget["records"])
+        page_sizer["min"] = min(page_sizer["min"], page_sizer["max"])
+        page_sizer["size"] = min(page_sizer["size"], page_sizer["max"])
+    prefetch_depth = int(configuration.get('prefetch_depth', '2'))
+
+    # Retrieve the state for change data capture
+    cursor = state.get(cursor_key)
+
+    # Retrieve the high-watermark of the last completed sync for incremental syncs. Watermarks are opt-in: records
+    # older than the watermark are dropped, which is only safe when the API never moves a changed record's value back
+    watermark_field = configuration.get('watermark_field', '')
+    watermark_param = configuration.get('watermark_param')
+    watermark = state.get('watermark') if watermark_field else None
+    pending_watermark = state.get('pending_watermark', watermark) if cursor or "partitions" in state else watermark
+
+    # An initial sync can be split into partitions fetched concurrently, each resuming from its own cursor
+    partitions = backfill_partitions(configuration, state, dataset)
+
+    # Set up the parameters for the API request
+    url = f"{base_url}{dataset['endpoint']}"
+    params = {"page_size": page_sizer["size"]}
+    if partitions is not None:
+        done = sum(1 for progress in partitions.values() if not progress["has_more"])
+        log.info(f"{table}: starting partitioned backfill, {done} of {len(partitions)} partitions complete")
+    elif cursor:
+        params["cursor"] = cursor
+        log.info(f"{table}: starting sync from cursor: {cursor}")
+    elif watermark is not None:
+        log.info(f"{table}: starting incremental sync from watermark: {watermark}")
+    else:
+        log.info(f"{table}: starting initial sync")
+
+    # Ask the API for changed records only when it supports a server-side filter
+    if watermark is not None and watermark_param:
+        params[watermark_param] = watermark
+
+    # Skip records whose content is unchanged since they were last checkpointed; a full re-sync starts from an empty store
+    if digest_store and not state:
+        clear_digests(digest_store, table)
+    page_digests = []
+    identical_count = 0
+
+    # Convert values to the declared column types once, at ingest
+    coerce = build_coercer(dataset["columns"]) if typed_schema(configuration) else None
+    invalid_columns = {}
+
+    # Count records that cannot be upserted and log them once per page instead of once per record
+    skips = skip_reporter(table)
+    quarantine = quarantine_enabled(configuration)
+
+    record_count = 0
+    pages_read = 0
+    rate_limit_restarts = 0
+    watermark_dropped = 0
+    byte_count = 0
+    budget_reason = None
+    has_more = True
+    status = "completed"
+    totals = {"pages": 0, "records": 0, "skipped": 0, "bytes": 0, "latency": 0.0, "retries": 0, "throttle_wait": 0.0, "checkpoints": 0, "health": None}
+
+    # Checkpoint on the configured cadence; the state of the last complete page is always flushed before stopping
+    cadence = checkpoint_policy(configuration)
+    since_checkpoint = {"records": 0, "bytes": 0, "started": time.monotonic()}
+    pending_state = None
+
+    def flush_checkpoint():
+        nonlocal page_digests, pending_state
+        if page_digests:
+            yield "digests", page_digests
+            page_digests = []
+        yield "checkpoint", pending_state
+        pending_state = None
+        totals["checkpoints"] += 1
+        since_checkpoint.update(records=0, bytes=0, started=time.monotonic())
+
+    def page_row(page, page_upserts, page_records, page_cursor, checkpointing):
+        """Build a page's metrics row and add it to the sync totals"""
+        row = page_metrics(sync_id, table, totals["pages"] + 1, page, page_upserts, page_records - page_upserts, page_cursor, checkpointing)
+        totals["pages"] += 1
+        totals["records"] += row["records"]
+        totals["skipped"] += row["skipped_records"]
+        totals["bytes"] += row["bytes"]
+        totals["latency"] += page["latency"] or 0.0
+        totals["retries"] += row["retries"]
+        totals["throttle_wait"] += page["throttle_wait"]
+        return row
+
+    # Fetch pages in the background while records are being yielded
+    prefetch = {"async": async_prefetch_pages, "replay": replay_pages}.get(client["engine"], prefetch_pages)
+
+    def fetch_pages():
+        if partitions is not None:
+            return partition_pages(prefetch, configuration, client, url, params, partitions, page_sizer, prefetch_depth, dataset["records_key"])
+        return prefetch(client, url, params, page_sizer, prefetch_depth, dataset["records_key"])
+
+    pages = fetch_pages()
+    while has_more:
+        try:
+            # Take the next page from the prefetcher (retries happen on the fetch side)
+            page = next(pages)
+
+            # Process records as they are decoded from the response
+            page_records = 0
+            page_start = record_count
+            for record in page["records"]:
+                # Once the record budget is spent, stop mid-page and resume from the start of this page. The first
+                # page of a sync is always finished, so every sync moves the cursor on even if the API returns
+                # more records than were asked for
+                if budget["records"] and record_count >= budget["records"] and pages_read:
+                    budget_reason = "records"
+                    break
+                page_records += 1
+                # Set aside records without a primary key
+                reason = skip_reason(record, dataset["primary_key"])
+                if reason:
+                    report_skip(skips, reason, record)
+                    if quarantine:
+                        yield "quarantine", quarantine_row(table, reason, record)
+                    continue
+                # Track the high-watermark and skip records unchanged since the last completed sync
+                record_mark = record_watermark(record, watermark_field)
+                if record_mark is not None:
+                    if pending_watermark is None or record_mark > pending_watermark:
+                        pending_watermark = record_mark
+                    if watermark is not None and record_mark < watermark:
+                        watermark_dropped += 1
+                        continue
+                if digest_store:
+                    key = record_key(record, dataset["primary_key"])
+                    digest = record_digest(record)
+                    if stored_digest(digest_store, table, key) == digest:
+                        identical_count += 1
+                        continue
+                    page_digests.append((key, digest))
+                if coerce:
+                    for name in coerce(record):
+                        invalid_columns[name] = invalid_columns.get(name, 0) + 1
+                yield "upsert", record
+                record_count += 1
+            flush_skips(skips)
+
+            if budget_reason:
+                # The page's cursor and partition progress are left as they were, so the page is fetched again
+                # and its records already upserted are upserted once more (upserts are idempotent)
+                status = "budget_records"
+                if partitions is not None:
+                    pending_state = build_backfill_state(partitions, pending_watermark, page_sizer["size"])
+                    page_cursor = f"{page['partition']}:{partitions[page['partition']]['cursor']}"
+                else:
+                    pending_state = build_state(cursor_key, cursor, watermark, pending_watermark, True, page_sizer["size"])
+                    page_cursor = cursor
+                byte_count += page["bytes"]
+                if sync_id:
+                    yield "metrics", page_row(page, record_count - page_start, page_records, page_cursor, True)
+                log.info(f"{table}: record budget reached after {page_records} records of the page, resuming from cursor: {page_cursor}")
+                break
+
+            # The page's metadata, size and latency are complete once its records have been read
+            pages_read += 1
+            rate_limit_restarts = 0
+            data = page["data"]
+            byte_count += page["bytes"]
+
+            # Tune the page size for the following requests from this page's latency
+            adjust_page_size(page_sizer, page["latency"], page_records, page["page_size"])
+
+            # Update pagination info
+            next_cursor = data.get("next_cursor")
+            if partitions is not None:
+                # Each partition follows its own cursor chain, and the backfill is complete once all of them are
+                progress = partitions[page["partition"]]
+                progress["has_more"] = data.get("has_more", False)
+                if next_cursor:
+                    progress["cursor"] = next_cursor
+                has_more = any(progress["has_more"] for progress in partitions.values())
+                page_cursor = f"{page['partition']}:{progress['cursor']}"
+            else:
+                has_more = data.get("has_more", False)
+                if next_cursor or not dataset["keep_last_cursor"]:
+                    cursor = next_cursor
+                if next_cursor:
+                    params["cursor"] = next_cursor
+                page_cursor = cursor
+
+            # The state to resume from once this page is checkpointed
+            if partitions is not None and has_more:
+                pending_state = build_backfill_state(partitions, pending_watermark, page_sizer["size"])
+            else:
+                pending_state = build_state(cursor_key, cursor, watermark, pending_watermark, has_more, page_sizer["size"])
+            since_checkpoint["records"] += page_records
+            since_checkpoint["bytes"] += page["bytes"]
+            checkpointing = not has_more or checkpoint_due(cadence, since_checkpoint)
+
+            # Record the page's measurements ahead of the checkpoint that covers them
+            if sync_id:
+                yield "metrics", page_row(page, record_count - page_start, page_records, page_cursor, checkpointing)
+
+            if checkpointing:
+                yield from flush_checkpoint()
+                log.info(f"{table}: processed batch of {page_records} records, checkpoint at {record_count} records, cursor: {page_cursor}, has_more: {has_more}")
+            else:
+                log.info(f"{table}: processed batch of {page_records} records, {record_count} records so far, cursor: {page_cursor}, has_more: {has_more}")
+
+            # Stop paging once a sync budget limit is reached; the time and byte budgets are checked once per page
+            budget_reason = budget_exhausted(budget, record_count, byte_count) if has_more else None
+            if budget_reason:
+                status = f"budget_{budget_reason}"
+                break
+
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code == 401:
+                status = "error"
+                log.severe("Authentication failed - check API key")
+                break
+            elif e.response.status_code == 403:
+                status = "error"
+                log.severe("Access forbidden - check API permissions")
+                break
+            elif e.response.status_code == 429:
+                # The fetcher already backed off per the rate limit headers; stop if the time budget is spent
+                budget_reason = budget_exhausted(budget, record_count, byte_count)
+                if budget_reason:
+                    status = f"budget_{budget_reason}"
+                    break
+                # Restart the fetcher only as often as a request is retried, so an endpoint that never stops
+                # throttling ends the sync instead of looping on it
+                rate_limit_restarts += 1
+                if rate_limit_restarts >= RETRY_POLICIES["rate_limit"]["attempts"]:
+                    status = "error"
+                    log.severe(f"{table}: rate limit still exceeded after {rate_limit_restarts} restarts of the fetcher, stopping this sync")
+                    break
+                log.warning(f"{table}: rate limit still exceeded after retries, resuming once the rate limiter allows requests")
+                # The fetcher stops on errors, so resume it from the current cursor
+                pages.close()
+                pages = fetch_pages()
+                continue
+            else:
+                status = "error"
+                log.severe(f"HTTP error: {e.response.status_code} - {e.response.text}")
+                break
+        except CircuitOpenError as e:
+            # Give up on this dataset for this sync so the shared workers move on to healthy endpoints
+            status = "circuit_open"
+            log.warning(f"{table}: {str(e)}")
+            break
+        except requests.exceptions.RequestException as e:
+            status = "error"
+            log.severe(f"API request failed: {str(e)}")
+            break
+        except Exception as e:
+            status = "error"
+            log.severe(f"Unexpected error processing response: {str(e)}")
+            break
+
+    # Errors and budget limits stop the loop between checkpoints, so save the progress of the pages already read
+    if pending_state is not None:
+        yield from flush_checkpoint()
+
+    # The endpoint's health at the end of the sync, including any failures after the last page
+    if client.get("breakers"):
+        totals["health"] = health_score(endpoint_breaker(client["breakers"], url))
+        log.info(f"{table}: API health score {totals['health']}/100")
+
+    if sync_id:
+        yield "metrics", summary_metrics(sync_id, table, totals, cursor, time.time() - budget["started"], status)
+
+    if invalid_columns:
+        summary = ", ".join(f"{name} ({count})" for name, count in sorted(invalid_columns.items()))
+        log.warning(f"{table}: loaded values that did not match their declared column type as null: {summary}")
+
+    skipped = skip_totals(skips)
+    if skipped:
+        log.warning(f"{table}: skipped records that could not be upserted: {skipped}")
+
+    if watermark_dropped:
+        log.warning(f"{table}: dropped {watermark_dropped} records with {watermark_field} older than the watermark {watermark} without upserting them")
+
+    if digest_store:
+        seen = identical_count + record_count
+        log.info(f"{table}: skipped {identical_count} of {seen} records with unchanged content ({identical_count / seen if seen else 0:.1%})")
+
+    if status in ("error", "circuit_open"):
+        log.warning(f"{table}: sync stopped after {record_count} records, resuming from cursor: {cursor}")
+    elif budget_reason:
+        log.info(f"{table}: sync budget reached ({budget_reason}) after {record_count} records and {byte_count} bytes in {time.time() - budget['started']:.1f}s. Backlog remains from cursor: {cursor}")
+    else:
+        log.info(f"{table}: sync completed with {record_count} total records")
+
+def sync_concurrently(configuration, client, datasets, state, budget, workers, digest_store, sync_id):
+    """Run sync_dataset for each dataset on a bounded pool of worker threads and yield (table, kind, payload) events"""
+    # Bound the events waiting for the main thread so fast workers cannot buffer whole datasets in memory
+    events = queue.Queue(maxsize=EVENT_QUEUE_SIZE)
+    stop = threading.Event()
+
+    def run(dataset):
+        table = dataset["table"]
+        dataset_events = sync_dataset(configuration, client, dataset, state.get(table, {}), budget, digest_store, sync_id)
+        try:
+            for kind, payload in dataset_events:
+                if not put_until_stopped(events, (table, kind, payload), stop):
+                    return
+        except Exception as e:
+            log.severe(f"{table}: unexpected error during sync: {str(e)}")
+        finally:
+            dataset_events.close()
+            put_until_stopped(events, (table, "done", None), stop)
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dataset-sync")
+    for dataset in datasets:
+        pool.submit(run, dataset)
+    try:
+        remaining = len(datasets)
+        while remaining:
+            table, kind, payload = events.get()
+            if kind == "done":
+                remaining -= 1
+            else:
+                yield table, kind, payload
+    finally:
+        stop.set()
+        pool.shutdown(wait=False)
+
+def sync_datasets(configuration, state, datasets):
+    """Sync the datasets concurrently over one shared HTTP client and yield Fivetran operations"""
+    # Validate configuration
+    api_key = configuration.get('api_key')
+    if not api_key:
+        log.severe("API key is missing from configuration")
+        return
+
+    base_url = configuration.get('base_url')
+    if not base_url:
+        log.severe("Base URL is missing from configuration")
+        return
+
+    # Each worker also runs a page prefetcher per backfill partition, so size the connection pool for all of them
+    workers = max(1, min(len(datasets), int(configuration.get('max_concurrent_datasets', '4'))))
+    pool_size = max(10, 2 * workers * max(1, int(configuration.get('backfill_partitions', '0'))))
+    if journal_mode(configuration) == "replay":
+        client = create_replay_client(configuration)
+    elif http_engine(configuration) == "async":
+        client = create_async_client(configuration, pool_size)
+    else:
+        client = create_client(configuration, pool_size)
+    client["journal"] = open_journal(configuration)
+    budget = sync_budget(configuration)
+    digest_store = open_digest_store(configuration)
+    sync_id = new_sync_id() if sync_metrics_enabled(configuration) else None
+
+    # Digests waiting for their table's next checkpoint to be emitted
+    pending_digests = {}
+
+    try:
+        # A single dataset keeps the flat state layout of the standalone connectors
+        if len(datasets) == 1:
+            dataset = datasets[0]
+            table = dataset["table"]
+            for kind, payload in sync_dataset(configuration, client, dataset, state, budget, digest_store, sync_id):
+                if kind == "upsert":
+                    yield op.upsert(table, payload)
+                elif kind == "metrics":
+                    yield op.upsert(METRICS_TABLE, payload)
+                elif kind == "quarantine":
+                    yield op.upsert(QUARANTINE_TABLE, payload)
+                elif kind == "digests":
+                    pending_digests[table] = payload
+                else:
+                    yield op.checkpoint(payload)
+                    if table in pending_digests:
+                        save_digests(digest_store, table, pending_digests.pop(table))
+            return
+
+        # Several datasets keep their state under their table name and are fetched concurrently,
+        # with every operation emitted from this thread in the order the workers produced them
+        log.info(f"Syncing {len(datasets)} datasets with {workers} concurrent workers")
+        for table, kind, payload in sync_concurrently(configuration, client, datasets, state, budget, workers, digest_store, sync_id):
+            if kind == "upsert":
+                yield op.upsert(table, payload)
+            elif kind == "metrics":
+                yield op.upsert(METRICS_TABLE, payload)
+            elif kind == "quarantine":
+                yield op.upsert(QUARANTINE_TABLE, payload)
+            elif kind == "digests":
+                pending_digests.setdefault(table, []).extend(payload)
+            else:
+                state = {**state, table: payload}
+                yield op.checkpoint(state)
+                # The checkpoint covers every table's upserts so far, so every pending digest is now safe to save
+                for pending_table in list(pending_digests):
+                    save_digests(digest_store, pending_table, pending_digests.pop(pending_table))
+
+    except Exception as e:
+        log.severe(f"Unexpected error in update function: {str(e)}")
+    finally:
+        close_digest_store(digest_store)
+        close_journal(client["journal"])
+        if client["engine"] == "async":
+            close_async_client(client)
@@ -0,0 +1,215 @@
+"""Local stand-in for the demo API: serves every /xxx_data endpoint with the same cursor contract.
+
+Records are generated from the sample record in each industry's Prompts/user_prompt.txt. Record n of a dataset is
+always the same for a given seed, so a dataset of any size is served without being held in memory.
+
+    python mock_api.py --port 8000 --records 100000 --latency-ms 20 --error-rate 0.01 --rate-limit-every 50
+
+Point a connector at it with "base_url": "http://127.0.0.1:8000" in configuration.json.
+"""
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import glob
+import random
+import argparse
+import threading
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATE_PREFIX = re.compile(r'(\d{4}-\d\d-\d\d)(.*)$')
+DIGITS = re.compile(r'\d+')
+
+def load_samples(repo_root=REPO_ROOT):
+    """Return the sample record of every industry, keyed by endpoint prefix (agr, cds, ...)"""
+    samples = {}
+    for path in sorted(glob.glob(os.path.join(repo_root, "*", "Prompts", "user_prompt.txt"))):
+        prefix = os.path.basename(os.path.dirname(os.path.dirname(path)))[:3].lower()
+        with open(path, "r") as f:
+            text = f.read()
+        start = text.index("{", text.lower().index("sample record"))
+        samples[prefix], _ = json.JSONDecoder().raw_decode(text, start)
+    return samples
+
+def generate_value(name, sample, index, rng):
+    """Generate a value for one field, shaped like the sample value"""
+    if name == "record_id":
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+    if name == "last_updated_epoch":
+        # Increase with the record index so watermark syncs see a steady stream of newer records
+        return sample + index
+    if isinstance(sample, bool):
+        return rng.random() < 0.5
+    if isinstance(sample, int):
+        return rng.randint(min(0, 2 * sample), max(1, 2 * sample))
+    if isinstance(sample, float):
+        decimals = len(repr(sample).split(".")[1]) if "." in repr(sample) else 2
+        return round(rng.uniform(min(0.0, 2 * sample), max(1.0, 2 * sample)), decimals)
+    if isinstance(sample, str):
+        match = DATE_PREFIX.match(sample)
+        if match:
+            day = datetime.strptime(match.group(1), "%Y-%m-%d") + timedelta(days=rng.randint(-365, 365))
+            return day.strftime("%Y-%m-%d") + match.group(2)
+        if name.endswith("_id"):
+            return DIGITS.sub(lambda digits: str(rng.randrange(10 ** len(digits.group()))).zfill(len(digits.group())), sample)
+    return sample
+
+def generate_record(sample, index, seed):
+    """Generate record number index of a dataset; the same index and seed always give the same record"""
+    rng = random.Random(seed * 1000003 + index)
+    return {name: generate_value(name, value, index, rng) for name, value in sample.items()}
+
+def record_templates(sample, pool_size, seed):
+    """Pre-serialize pool_size generated records with placeholders for record_id and last_updated_epoch.
+
+    Serving record n as template n % pool_size is much faster than generating it, which keeps the server from being
+    the bottleneck when benchmarking connectors; only record_id and last_updated_epoch stay unique per record.
+    """
+    templates = []
+    for index in range(pool_size):
+        record = generate_record(sample, index, seed)
+        record["record_id"] = "@@RECORD_ID@@"
+        if "last_updated_epoch" in record:
+            record["last_updated_epoch"] = "@@EPOCH@@"
+        text = json.dumps(record).replace("%", "%%")
+        templates.append(text.replace('"@@RECORD_ID@@"', '"%(record_id)s"').replace('"@@EPOCH@@"', "%(epoch)d"))
+    return templates
+
+def pooled_records_json(templates, sample, indexes, seed):
+    """Return the JSON array of the records at indexes built from the pre-serialized templates"""
+    base_epoch = sample.get("last_updated_epoch", 0)
+    parts = []
+    for index in indexes:
+        values = {"record_id": f"{index:08x}-0000-4000-8000-{seed:012x}", "epoch": base_epoch + index}
+        parts.append(templates[index % len(templates)] % values)
+    return "[" + ",".join(parts) + "]"
+
+def encode_cursor(offset):
+    return f"{offset:016x}"
+
+def decode_cursor(cursor):
+    return int(cursor, 16)
+
+def make_handler(samples, options):
+    """Build the request handler for the given samples and server options"""
+    counter = {"requests": 0}
+    lock = threading.Lock()
+    templates = {prefix: record_templates(sample, options.record_pool, options.seed) for prefix, sample in samples.items()} if options.record_pool else {}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are written separately, so Nagle's algorithm would hold small responses back ~40ms
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            if options.verbose:
+                super().log_message(format, *args)
+
+        def send_json(self, status, body, headers=None):
+            payload = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            match = re.fullmatch(r"/([a-z]{3})_data", url.path)
+            if not match or match.group(1) not in samples:
+                return self.send_json(404, {"error": f"Unknown endpoint {url.path}"})
+            prefix = match.group(1)
+
+            if options.api_key and self.headers.get("x-api-key") != options.api_key:
+                return self.send_json(401, {"error": "Invalid API key"})
+
+            with lock:
+                counter["requests"] += 1
+                request_number = counter["requests"]
+
+            # 429 bursts: after every rate_limit_every requests, the next rate_limit_burst requests are rejected
+            if options.rate_limit_every and request_number % (options.rate_limit_every + options.rate_limit_burst) >= options.rate_limit_every:
+                return self.send_json(429, {"error": "Too many requests"}, {"Retry-After": str(options.retry_after)})
+            if options.error_rate and random.random() < options.error_rate:
+                return self.send_json(500, {"error": "Injected server error"})
+
+            try:
+                page_size = int(query.get("page_size", options.default_page_size))
+                offset = decode_cursor(query["cursor"]) if query.get("cursor") else 0
+                partitions = int(query.get("partitions", 1))
+                partition = int(query.get("partition", 0))
+            except ValueError:
+                return self.send_json(400, {"error": "Invalid page_size, cursor or partition"})
+            if partitions < 1 or not 0 <= partition < partitions:
+                return self.send_json(400, {"error": "partition must be between 0 and partitions - 1"})
+            page_size = max(1, min(page_size, options.max_page_size))
+
+            # Partition p of n holds records p, p + n, p + 2n, ...; the cursor counts records within the partition
+            partition_records = len(range(partition, options.records, partitions))
+            end = min(offset + page_size, partition_records)
+            has_more = end < partition_records
+            indexes = range(partition + max(offset, 0) * partitions, partition + max(end, 0) * partitions, partitions)
+            if prefix in templates:
+                records_json = pooled_records_json(templates[prefix], samples[prefix], indexes, options.seed)
+            else:
+                records_json = json.dumps([generate_record(samples[prefix], index, options.seed) for index in indexes])
+
+            latency = options.latency_ms + options.latency_per_record_ms * max(end - offset, 0)
+            if latency:
+                time.sleep(latency / 1000)
+
+            next_cursor = json.dumps(encode_cursor(end) if has_more else None)
+            body = f'{{"{prefix}_records": {records_json}, "next_cursor": {next_cursor}, "has_more": {json.dumps(has_more)}}}'
+            self.send_json(200, body.encode("utf-8"))
+
+    return Handler
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients dropping keep-alive connections are expected; report anything else
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+def create_server(options, samples=None, host="127.0.0.1"):
+    """Create the mock API server; call serve_forever() on it, or run it on a thread for in-process use"""
+    samples = samples if samples is not None else load_samples()
+    return MockServer((host, options.port), make_handler(samples, options))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the demo API's /xxx_data endpoints")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on (0 picks a free port)")
+    parser.add_argument("--records", type=int, default=1000, help="Number of records in each dataset")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the generated records")
+    parser.add_argument("--default-page-size", type=int, default=100, help="Page size when the request does not set one")
+    parser.add_argument("--max-page-size", type=int, default=200, help="Largest page size served; larger requests are clamped")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fixed latency added to every page")
+    parser.add_argument("--latency-per-record-ms", type=float, default=0.0, help="Latency added per record in the page")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 500")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Serve this many requests between 429 bursts (0 disables)")
+    parser.add_argument("--rate-limit-burst", type=int, default=3, help="Number of requests rejected with 429 in each burst")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with a 429")
+    parser.add_argument("--record-pool", type=int, default=0, help="Serve copies of this many pre-generated records, unique only in record_id and last_updated_epoch (0 generates every record)")
+    parser.add_argument("--api-key", default=None, help="Require this x-api-key header (any key is accepted when unset)")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    options = parse_args()
+    samples = load_samples()
+    server = create_server(options, samples)
+    print(f"Serving {len(samples)} endpoints with {options.records} records each on http://127.0.0.1:{server.server_address[1]}")
+    print("Endpoints: " + ", ".join(f"/{prefix}_data" for prefix in sorted(samples)))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        sys.exit(0)
@@ -0,0 +1,75 @@
+"""Regression tests for the per-sync record budget, run against the local mock API:
+
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import threading
+import unittest
+
+ENGINE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ENGINE_DIR)
+
+from fivetran_connector_sdk import Logging
+Logging.LOG_LEVEL = Logging.Level.WARNING
+
+import mock_api
+import connector_engine.sync as sync
+from connector_engine.datasets import DATASETS
+
+class RecordingOperations:
+    """Return operations as tuples instead of handing them to the SDK"""
+    @staticmethod
+    def upsert(table, data):
+        return ("upsert", table, data)
+
+    @staticmethod
+    def checkpoint(state):
+        return ("checkpoint", state)
+
+class RecordBudgetTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = mock_api.create_server(mock_api.parse_args(["--port", "0", "--records", "1000"]))
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.operations = sync.op
+        sync.op = RecordingOperations
+        cls.dataset = next(dataset for dataset in DATASETS.values() if not dataset["keep_last_cursor"])
+
+    @classmethod
+    def tearDownClass(cls):
+        sync.op = cls.operations
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def run_sync(self, state, **configuration):
+        configuration = {"api_key": "test", "base_url": self.base_url, "sync_metrics": "false", **configuration}
+        operations = list(sync.sync_datasets(configuration, state, [self.dataset]))
+        upserts = [operation[2] for operation in operations if operation[0] == "upsert"]
+        checkpoints = [operation[1] for operation in operations if operation[0] == "checkpoint"]
+        return upserts, checkpoints[-1]
+
+    def assert_budgeted_syncs_advance(self, budget, page_size, syncs=2):
+        state = {}
+        cursors = []
+        keys = []
+        for _ in range(syncs):
+            upserts, state = self.run_sync(state, max_sync_records=str(budget), page_size=page_size)
+            self.assertEqual(len(upserts), budget)
+            cursors.append(state[self.dataset["state_key"]])
+            keys += [tuple(record[key] for key in self.dataset["primary_key"]) for record in upserts]
+        self.assertNotIn(None, cursors)
+        self.assertEqual(len(set(cursors)), syncs)
+        # Each sync starts after the records the previous one checkpointed
+        self.assertGreater(len(set(keys)), budget * (syncs - 1))
+
+    def test_budget_below_page_size(self):
+        self.assert_budgeted_syncs_advance(50, "100")
+
+    def test_budget_between_page_sizes(self):
+        # The adaptive page size grows past the budget once the first pages come back quickly
+        self.assert_budgeted_syncs_advance(150, "100", syncs=3)
+
+if __name__ == "__main__":
+    unittest.main()
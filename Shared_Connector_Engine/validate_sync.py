@@ -0,0 +1,282 @@
+"""Non-interactive replacement for debug_and_validate.sh that profiles the synced tables after a debug run.
+
+Run it from an industry's Custom_Connector_Code_Working_Version folder. It resets the connector, runs
+`fivetran debug`, then checks files/warehouse.db with DuckDB:
+
+- row counts against the records the connector reported in connector_sync_metrics
+- duplicate primary keys
+- null rates per column
+- column types against the dataset spec
+- sync throughput
+
+It exits with 1 when a check fails or a baseline comparison regresses:
+
+    python ../../Shared_Connector_Engine/validate_sync.py --output profile.json --baseline previous_profile.json
+
+Use --skip-debug to profile the warehouse of an earlier run without syncing again.
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+WAREHOUSE_DB = os.path.join("files", "warehouse.db")
+SCHEMA = "tester"
+METRICS_TABLE = "connector_sync_metrics"
+DEBUG_LOG = "debug_output.log"
+
+# DuckDB type families accepted for each declared column type. Types are compared without their parameters, so
+# DECIMAL(38, 10) counts as DECIMAL. The families are deliberately wide, so only a column stored as a different kind
+# of value (a number as VARCHAR, a date as BIGINT) counts as drift.
+WAREHOUSE_TYPES = {
+    "BOOLEAN": {"BOOLEAN"},
+    "LONG": {"TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT", "DECIMAL"},
+    "DOUBLE": {"FLOAT", "REAL", "DOUBLE", "DECIMAL"},
+    "NAIVE_DATE": {"DATE"},
+    "NAIVE_DATETIME": {"TIMESTAMP", "TIMESTAMP_S", "TIMESTAMP_MS", "TIMESTAMP_NS", "DATETIME"},
+    "UTC_DATETIME": {"TIMESTAMP WITH TIME ZONE", "TIMESTAMPTZ", "TIMESTAMP"},
+    "STRING": {"VARCHAR", "TEXT"},
+    "JSON": {"JSON", "VARCHAR"},
+}
+
+def run_debug(configuration_file, log_path):
+    """Reset the connector and run fivetran debug, echoing its output and keeping a copy in log_path"""
+    print("Resetting connector state: fivetran reset")
+    reset = subprocess.run(["fivetran", "reset"], input="Y\n", text=True)
+    if reset.returncode != 0:
+        raise RuntimeError("fivetran reset failed")
+
+    print(f"Running: fivetran debug --configuration {configuration_file}")
+    started = time.time()
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    with open(log_path, "w") as log_file:
+        debug = subprocess.Popen(["fivetran", "debug", "--configuration", configuration_file],
+                                 stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, env=env)
+        for line in debug.stdout:
+            sys.stdout.write(line)
+            log_file.write(line)
+        debug.wait()
+    if debug.returncode != 0:
+        raise RuntimeError(f"fivetran debug exited with {debug.returncode}")
+    return time.time() - started
+
+def reported_upserts(log_path):
+    """Return the Upserts count of the tester's SYNC PROGRESS summary in the debug log, or None when there is none.
+
+    The summary is the Operation | Calls table that debug_and_validate.sh prints, for example "Upserts | 600".
+    """
+    if not os.path.exists(log_path):
+        return None
+    with open(log_path, "r") as f:
+        output = f.read()
+    if "SYNC PROGRESS:" not in output:
+        return None
+    summary = output.rsplit("SYNC PROGRESS:", 1)[1]
+    match = re.search(r"\bUpserts\s*\|\s*(\d+)", summary)
+    return int(match.group(1)) if match else None
+
+def base_type(data_type):
+    """Return a DuckDB column type without its parameters, e.g. DECIMAL for DECIMAL(38,10)"""
+    return re.sub(r"\(.*\)", "", data_type.upper()).strip()
+
+def connector_tables(connector_file):
+    """Return the tables the connector syncs, read from its DATASETS["..."] references"""
+    with open(connector_file, "r") as f:
+        return re.findall(r'DATASETS\["([^"]+)"\]', f.read())
+
+def dataset_specs(connector_dir):
+    """Import the dataset specs from the connector's engine, or return {} when it cannot be imported"""
+    sys.path.insert(0, os.path.abspath(connector_dir))
+    try:
+        from connector_engine.datasets import DATASETS
+        return DATASETS
+    except ImportError:
+        return {}
+
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+def warehouse_tables(conn):
+    rows = conn.execute("SELECT table_name FROM information_schema.tables WHERE table_schema = ?", [SCHEMA]).fetchall()
+    return {row[0] for row in rows}
+
+def sync_summaries(conn):
+    """Return the summary rows of the latest sync in connector_sync_metrics, keyed by table"""
+    if METRICS_TABLE not in warehouse_tables(conn):
+        return {}
+    rows = conn.execute(
+        f"SELECT table_name, records, skipped_records, duration_seconds, status, health_score "
+        f"FROM {SCHEMA}.{METRICS_TABLE} WHERE row_type = 'summary' AND sync_id = ("
+        f"SELECT sync_id FROM {SCHEMA}.{METRICS_TABLE} WHERE row_type = 'summary' ORDER BY recorded_at DESC LIMIT 1)"
+    ).fetchall()
+    keys = ("records", "skipped_records", "duration_seconds", "status", "health_score")
+    return {row[0]: dict(zip(keys, row[1:])) for row in rows}
+
+def profile_table(conn, table, spec, summary, check_types=True):
+    """Profile one synced table and return its measurements and failed checks"""
+    columns = conn.execute(
+        "SELECT column_name, data_type FROM information_schema.columns WHERE table_schema = ? AND table_name = ? ORDER BY ordinal_position",
+        [SCHEMA, table],
+    ).fetchall()
+    # Columns added by Fivetran are not part of the data
+    columns = [(name, data_type) for name, data_type in columns if not name.startswith("_fivetran")]
+    primary_key = spec.get("primary_key", ["record_id"])
+
+    counts = conn.execute(
+        f"SELECT COUNT(*), COUNT(DISTINCT ({', '.join(quote(key) for key in primary_key)})), "
+        + ", ".join(f"COUNT({quote(name)})" for name, _ in columns)
+        + f" FROM {SCHEMA}.{quote(table)}"
+    ).fetchone()
+    rows, distinct_keys = counts[0], counts[1]
+    null_rates = {name: round(1 - count / rows, 4) if rows else 0.0 for (name, _), count in zip(columns, counts[2:])}
+
+    failures = []
+    if rows != distinct_keys:
+        failures.append(f"{rows - distinct_keys} duplicate {'/'.join(primary_key)} values")
+
+    # Compare the warehouse column types with the types declared in the dataset spec
+    types = {name: data_type.upper() for name, data_type in columns}
+    declared_columns = spec.get("columns", {}) if check_types else {}
+    drift = {}
+    for name, declared in declared_columns.items():
+        actual = types.get(name)
+        if actual is None:
+            drift[name] = f"{declared} declared, column missing"
+        elif base_type(actual) not in WAREHOUSE_TYPES.get(declared, {base_type(actual)}):
+            drift[name] = f"{declared} declared, {actual} in warehouse"
+    if drift:
+        failures.append(f"type drift in {len(drift)} columns: " + ", ".join(f"{name} ({reason})" for name, reason in drift.items()))
+    # A field the API added since the spec was written is loaded with an inferred type; that is worth a look, not a failure
+    undeclared = {name: types[name] for name in sorted(set(types) - set(declared_columns))} if declared_columns else {}
+
+    profile = {
+        "rows": rows,
+        "duplicate_keys": rows - distinct_keys,
+        "null_rates": null_rates,
+        "type_drift": drift,
+        "undeclared_columns": undeclared,
+        "reported_records": summary.get("records") if summary else None,
+        "sync_status": summary.get("status") if summary else None,
+        "health_score": summary.get("health_score") if summary else None,
+        "records_per_sec": None,
+    }
+    if summary and summary.get("duration_seconds"):
+        profile["records_per_sec"] = round(summary["records"] / summary["duration_seconds"], 1)
+    return profile, failures
+
+def compare(profiles, baseline, threshold):
+    """Return the regressions of each table's profile against a baseline profile"""
+    regressions = []
+    for table, profile in profiles.items():
+        before = baseline.get("tables", {}).get(table)
+        if not before:
+            continue
+        if before.get("records_per_sec") and profile["records_per_sec"] is not None:
+            change = profile["records_per_sec"] / before["records_per_sec"] - 1
+            if change < -threshold:
+                regressions.append(f"{table}: throughput {before['records_per_sec']} -> {profile['records_per_sec']} records/s ({change:+.0%})")
+        if before.get("rows") and profile["rows"] < before["rows"] * (1 - threshold):
+            regressions.append(f"{table}: rows {before['rows']} -> {profile['rows']}")
+        for name, rate in profile["null_rates"].items():
+            previous = before.get("null_rates", {}).get(name)
+            if previous is not None and rate - previous > threshold:
+                regressions.append(f"{table}.{name}: null rate {previous:.1%} -> {rate:.1%}")
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run fivetran debug and profile the synced DuckDB tables")
+    parser.add_argument("--connector-dir", default=".", help="Folder holding connector.py and configuration.json")
+    parser.add_argument("--configuration", default="configuration.json", help="Configuration file passed to fivetran debug")
+    parser.add_argument("--skip-debug", action="store_true", help="Profile the existing warehouse.db without resetting and syncing")
+    parser.add_argument("--tables", default="", help="Comma-separated tables to profile (the connector's tables when empty)")
+    parser.add_argument("--output", help="File the JSON profile is written to")
+    parser.add_argument("--baseline", help="Profile of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative throughput or row drop, or absolute null rate rise, reported as a regression")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        import duckdb
+    except ImportError:
+        print("duckdb is required: pip install duckdb")
+        return 2
+
+    os.chdir(args.connector_dir)
+    wall_seconds = None
+    if not args.skip_debug:
+        try:
+            wall_seconds = run_debug(args.configuration, DEBUG_LOG)
+        except (OSError, RuntimeError) as e:
+            print(f"Debug run failed: {e}")
+            return 2
+    if not os.path.exists(WAREHOUSE_DB):
+        print(f"{WAREHOUSE_DB} not found, run fivetran debug first")
+        return 2
+
+    specs = dataset_specs(".")
+    configuration = {}
+    if os.path.exists(args.configuration):
+        with open(args.configuration, "r") as f:
+            configuration = json.load(f)
+    # Without typed_schema the tester infers column types from the values, so there is no declared type to drift from
+    check_types = configuration.get('typed_schema', 'true').lower() == 'true'
+    tables = [table.strip() for table in args.tables.split(",") if table.strip()] or connector_tables("connector.py") or list(specs)
+    conn = duckdb.connect(WAREHOUSE_DB, read_only=True)
+    available = warehouse_tables(conn)
+    summaries = sync_summaries(conn)
+
+    profiles = {}
+    failures = []
+    for table in tables:
+        if table not in available:
+            failures.append(f"{table}: table not found in {SCHEMA} schema")
+            continue
+        profile, table_failures = profile_table(conn, table, specs.get(table, {}), summaries.get(table), check_types)
+        # After a reset every row comes from this sync, so the row count must match what the connector reported
+        if not args.skip_debug and profile["reported_records"] is not None and profile["reported_records"] != profile["rows"]:
+            table_failures.append(f"{profile['rows']} rows but {profile['reported_records']} records reported by the connector")
+        if profile["sync_status"] not in (None, "completed"):
+            table_failures.append(f"sync ended with status {profile['sync_status']}")
+        profiles[table] = profile
+        failures.extend(f"{table}: {failure}" for failure in table_failures)
+
+        print(f"\n{table}: {profile['rows']} rows, {profile['duplicate_keys']} duplicate keys, "
+              f"{profile['reported_records']} records reported, {profile['records_per_sec']} records/s, health {profile['health_score']}")
+        for name, rate in profile["null_rates"].items():
+            if rate:
+                print(f"  {name:<40} {rate:>7.1%} null")
+        if profile["undeclared_columns"]:
+            undeclared = ", ".join(f"{name} ({data_type})" for name, data_type in profile["undeclared_columns"].items())
+            print(f"  Warning: columns not declared in the dataset spec: {undeclared}")
+    conn.close()
+
+    upserts = reported_upserts(DEBUG_LOG) if not args.skip_debug else None
+    if upserts is not None:
+        print(f"\nTester reported {upserts} upserts in {wall_seconds:.1f}s ({upserts / wall_seconds:.0f} upserts/s including startup)")
+    elif not args.skip_debug:
+        print(f"\nNo SYNC PROGRESS summary with an Upserts count found in {DEBUG_LOG}; throughput not reported")
+
+    report = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "debug_seconds": wall_seconds, "tester_upserts": upserts, "tables": profiles}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Profile written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            failures.extend(compare(profiles, json.load(f), args.threshold))
+
+    if failures:
+        print(f"\n{len(failures)} check(s) failed:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("\nAll checks passed")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())